@@ -0,0 +1,28 @@
+"""
+Freshness checks for on-disk caches derived from a source file.
+
+A cache records the (mtime, size) of the file it was built from in a small
+JSON sidecar; any change to either invalidates it. Comparing for equality
+(rather than "cache newer than source") also catches a source replaced by
+an older copy, e.g. via cp -p, rsync -a or a backup restore.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict
+
+
+def source_stamp(path: Path) -> Dict[str, float]:
+    st = path.stat()
+    return {"mtime": st.st_mtime, "size": st.st_size}
+
+
+def cache_is_fresh(src: Path, meta_path: Path) -> bool:
+    try:
+        return json.loads(meta_path.read_text()) == source_stamp(src)
+    except (OSError, ValueError):
+        return False
+
+
+def write_cache_meta(src: Path, meta_path: Path) -> None:
+    meta_path.write_text(json.dumps(source_stamp(src)))
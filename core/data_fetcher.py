@@ -1,8 +1,9 @@
 """
 Data Fetcher Module for SmartTap
 Loads pre-downloaded data from local CSV files (AgriMet) and OpenET (Field/HUC).
-Produces a unified payload format:
-  {"spec": spec, "data": {"records": [ {"datetime": ..., <var1>: ..., <var2>: ...}, ... ]}}
+Produces a unified payload format (see core/payload.py):
+  {"spec": spec, "data": {"columns": {"datetime": ndarray, <var1>: ndarray, ...},
+                          "records": [ {"datetime": ..., <var1>: ..., <var2>: ...}, ... ]}}
 
 Extended to support location-based OpenET queries:
   - Query by city: "Show ETa for fields in Corvallis"
@@ -12,11 +13,25 @@ Extended to support location-based OpenET queries:
 
 import os
 import glob
+import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+import numpy as np
 import pandas as pd
+from .cache_meta import cache_is_fresh, write_cache_meta
 from .location_crop_query import LocationCropQuery
+from .payload import make_payload, payload_frame
+
+# Parquet caches need pyarrow; without it we read the CSVs directly
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = ds = None
 from .agrimet_api import fetch_agrimet_api_data
 
 
@@ -38,6 +53,35 @@ OPENET_DIR = DATA_DIR / "openet"
 OPENET_FIELD_COMBINED = OPENET_DIR / "field_combined_long.csv"
 OPENET_HUC_COMBINED = OPENET_DIR / "huc_combined_long.csv"
 
+# Parquet caches of the combined tables are hive-partitioned by year
+# (<name>.parquet/year=YYYY/...) and sorted by id inside each partition,
+# so row-group min/max statistics let an id lookup read about one row
+# group per year. (A directory per OPENET_ID would mean hundreds of
+# thousands of tiny files.)
+OPENET_CACHE_ROWS_PER_GROUP = 1 << 16
+
+# cache sort keys (first column present wins). HUC12 codes extend their
+# HUC8 code, so sorting by HUC12 keeps both lookups clustered.
+OPENET_FIELD_SORT_COLS = ("OPENET_ID",)
+OPENET_HUC_SORT_COLS = ("HUC12_code", "HUC12", "HUC8_code", "HUC8")
+
+# rows per chunk when the combined CSVs are streamed without pyarrow
+OPENET_CSV_CHUNK_ROWS = 1_000_000
+
+# Explicit dtypes for the combined CSVs: ids stay strings (no int inference
+# to undo later) and the variable/metric names are categorical.
+# Columns missing from a given file are ignored by read_csv.
+OPENET_CSV_DTYPES = {
+    "OPENET_ID": "str",
+    "HUC8_code": "str",
+    "HUC8": "str",
+    "HUC12_code": "str",
+    "HUC12": "str",
+    "variable": "category",
+    "metric": "category",
+    "value": "float64",
+}
+
 
 # -------------------------
 # AgriMet configuration
@@ -56,12 +100,36 @@ LOCATION_PREFIXES = {
     "ontario": "ontario_weather",
 }
 
+# SmartTap variable code -> (source columns, unrounded values from the
+# source column arrays). Shared by the local-file and API paths.
+VAR_MAP = {
+    "OBM": (["max_temp_f", "min_temp_f"], lambda c: (c["max_temp_f"] + c["min_temp_f"]) * 0.5),  # avg temp F
+    "MX": (["max_temp_f"], lambda c: c["max_temp_f"]),
+    "MN": (["min_temp_f"], lambda c: c["min_temp_f"]),
+    "PC": (["daily_precip_in"], lambda c: c["daily_precip_in"] * 25.4),  # precip in mm (from inches)
+    "SR": (["solar_langley"], lambda c: c["solar_langley"]),
+    "WS": (["wind_speed_mph"], lambda c: c["wind_speed_mph"]),
+}
+
+# explicit dtypes for the source columns (float64 keeps values exactly as
+# written, e.g. 45.3 rather than float32's 45.29999923706055)
+AGRIMET_CSV_DTYPES = {c: "float64" for cols, _ in VAR_MAP.values() for c in cols}
+
+# upper bound on threads used to read a multi-year AgriMet range
+AGRIMET_READ_WORKERS = 8
+
 
 def _require_file(path: Path, hint: str) -> None:
     if not path.exists():
         raise FileNotFoundError(f"Missing file: {path}\n{hint}")
 
 
+@lru_cache(maxsize=256)
+def _ts(s: Optional[str]) -> Optional[pd.Timestamp]:
+    """Parse a spec date string once; repeated specs reuse the Timestamp."""
+    return pd.Timestamp(s) if s else None
+
+
 def _pivot_long_to_wide(
     df: pd.DataFrame,
     time_col: str,
@@ -72,12 +140,19 @@ def _pivot_long_to_wide(
     Convert long format -> wide timeseries:
       datetime | var1 | var2 | ...
     """
+    # categorical keys group on integer codes instead of hashing strings per row;
+    # dictionary-encoded Parquet columns keep categories in first-seen order,
+    # so sort them to get pivot_table's sorted columns
+    keys = df[var_col].astype("category")
+    keys = keys.cat.reorder_categories(sorted(keys.cat.categories))
     wide = (
-        df.pivot_table(index=time_col, columns=var_col, values=value_col, aggfunc="mean")
-        .reset_index()
-        .sort_values(time_col)
+        df.groupby([df[time_col], keys], observed=True)[value_col]
+        .mean()
+        .unstack(var_col)
+        .dropna(axis=1, how="all")
     )
-    return wide
+    wide.columns = pd.Index(list(wide.columns), name=var_col)
+    return wide.reset_index()
 
 
 def _apply_interval(df: pd.DataFrame, interval: str) -> pd.DataFrame:
@@ -89,23 +164,14 @@ def _apply_interval(df: pd.DataFrame, interval: str) -> pd.DataFrame:
     if interval == "daily":
         return df
 
-    if interval == "monthly":
-        df = df.copy()
-        df["__m"] = pd.to_datetime(df["datetime"]).dt.to_period("M")
-        agg_cols = [c for c in df.columns if c not in {"datetime", "__m"}]
-        df = df.groupby("__m")[agg_cols].mean().reset_index()
-        df["datetime"] = df["__m"].dt.to_timestamp()
-        df = df.drop(columns=["__m"]).sort_values("datetime")
-        return df
-
-    if interval == "yearly":
-        df = df.copy()
-        df["__y"] = pd.to_datetime(df["datetime"]).dt.year
-        agg_cols = [c for c in df.columns if c not in {"datetime", "__y"}]
-        df = df.groupby("__y")[agg_cols].mean().reset_index()
-        df["datetime"] = pd.to_datetime(df["__y"].astype(str) + "-01-01")
-        df = df.drop(columns=["__y"]).sort_values("datetime")
-        return df
+    if interval in {"monthly", "yearly"}:
+        # bin on the DatetimeIndex with resample's fused grouper kernel
+        rule = "MS" if interval == "monthly" else "YS"
+        bins = df.set_index("datetime").resample(rule)
+        out = bins.mean()
+        # resample also emits bins for gaps in the data; keep only observed ones
+        out = out[bins.size().to_numpy() > 0]
+        return out.reset_index()
 
     if interval == "hourly":
         # your agrimet files are daily; openet is monthly/yearly. Don’t upsample.
@@ -120,6 +186,25 @@ def _apply_interval(df: pd.DataFrame, interval: str) -> pd.DataFrame:
 # AgriMet loading
 # -------------------------
 
+@lru_cache(maxsize=8)
+def _scan_csv_names(directory: Path, dir_mtime_ns: int) -> frozenset:
+    with os.scandir(directory) as it:
+        return frozenset(e.name for e in it if e.name.endswith(".csv"))
+
+
+def _csv_names(directory: Path) -> frozenset:
+    """
+    Names of the CSV files directly in `directory`. The listing is cached on
+    the directory's mtime, which changes whenever a file is added, removed
+    or renamed, so newly downloaded years show up on the next call.
+    """
+    try:
+        mtime_ns = directory.stat().st_mtime_ns
+    except OSError:
+        return frozenset()
+    return _scan_csv_names(directory, mtime_ns)
+
+
 def get_data_files_for_range(location: str, start_date: str, end_date: str) -> List[Path]:
     """
     Get list of CSV files needed to cover the date range.
@@ -139,20 +224,126 @@ def get_data_files_for_range(location: str, start_date: str, end_date: str) -> L
     prefix = LOCATION_PREFIXES[loc]
     files: List[Path] = []
 
+    # one cached listing per directory instead of two exists() calls per year
+    agrimet_names = _csv_names(AGRIMET_DIR)
+    legacy_names = _csv_names(DATA_DIR)
+
     for year in range(start_year, end_year + 1):
+        name = f"{prefix}_{year}.csv"
         # Prefer data/agrimet/...
-        p1 = AGRIMET_DIR / f"{prefix}_{year}.csv"
+        if name in agrimet_names:
+            files.append(AGRIMET_DIR / name)
         # Backward compatible: data/...
-        p2 = DATA_DIR / f"{prefix}_{year}.csv"
-
-        if p1.exists():
-            files.append(p1)
-        elif p2.exists():
-            files.append(p2)
+        elif name in legacy_names:
+            files.append(DATA_DIR / name)
 
     return files
 
 
+def _parse_agrimet_csv(csv_file: Path, columns: Optional[set] = None) -> pd.DataFrame:
+    """
+    Parse one yearly AgriMet CSV with explicit dtypes and a fixed ISO date
+    format, so pandas never falls back to type or per-row date inference.
+    Uses the multi-threaded pyarrow parser (which also parses the dates)
+    when available, else the C parser. `columns` limits the parse to those
+    columns (missing ones are skipped).
+    """
+    df_year = None
+    # the pyarrow engine rejects callable usecols, and column-limited
+    # parses only happen without pyarrow (the Feather cache is full-width)
+    if pa is not None and columns is None:
+        try:
+            df_year = pd.read_csv(
+                csv_file, sep=",", engine="pyarrow", dtype={**AGRIMET_CSV_DTYPES, "date": "datetime64[s]"}
+            )
+        except ValueError:
+            pass  # e.g. a malformed date; the C path below coerces it to NaT
+    if df_year is None:
+        usecols = None if columns is None else (lambda c: c in columns or c == "date")
+        df_year = pd.read_csv(csv_file, sep=",", engine="c", dtype=AGRIMET_CSV_DTYPES, usecols=usecols)
+    if "date" not in df_year.columns:
+        raise ValueError(f"AgriMet file missing 'date' column: {csv_file}")
+    if df_year["date"].dtype.kind != "M":  # pyarrow already parsed them
+        df_year["date"] = pd.to_datetime(df_year["date"], format="ISO8601", errors="coerce", cache=True)
+    return df_year.dropna(subset=["date"]).reset_index(drop=True)
+
+
+def _read_agrimet_csv(csv_file: Path, columns: Optional[set] = None) -> pd.DataFrame:
+    """
+    Load one yearly AgriMet file (optionally only `columns` plus date), going
+    through a Feather copy of the full parsed frame in <dir>/.cache/ when
+    pyarrow is available. The cache is rebuilt whenever the CSV's mtime or
+    size changes.
+    """
+    if pa is None:
+        return _parse_agrimet_csv(csv_file, columns)
+
+    cache_path = csv_file.parent / ".cache" / f"{csv_file.stem}.feather"
+    meta_path = cache_path.with_suffix(".meta.json")
+    if cache_path.exists() and cache_is_fresh(csv_file, meta_path):
+        if columns is None:
+            return pd.read_feather(cache_path)
+        names = pa.ipc.open_file(cache_path).schema.names
+        return pd.read_feather(cache_path, columns=[c for c in names if c in columns or c == "date"])
+
+    df_year = _parse_agrimet_csv(csv_file)
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        df_year.to_feather(cache_path)
+        write_cache_meta(csv_file, meta_path)
+    except OSError as e:
+        print(f"Warning: could not cache {csv_file.name}: {e}")
+    if columns is None:
+        return df_year
+    return df_year[[c for c in df_year.columns if c in columns or c == "date"]]
+
+
+def _build_agrimet_frame(
+    df: pd.DataFrame,
+    variables: List[str],
+    source: str,
+    skip_note: str,
+    zero_fill: Optional[Dict[str, str]] = None,
+) -> pd.DataFrame:
+    """
+    Compute the requested variable codes from AgriMet source columns and return
+    datetime + variables, rounded to 2 decimals in one pass.
+
+    Missing source columns raise "<source> missing ..." up front, except for
+    variables in `zero_fill` (code -> description), which are filled with 0.0
+    after a warning.
+    """
+    zero_fill = zero_fill or {}
+    for var in variables:
+        src_cols = VAR_MAP[var][0] if var in VAR_MAP else []
+        if var not in zero_fill and any(c not in df.columns for c in src_cols):
+            raise ValueError(f"{source} missing {'/'.join(src_cols)} for {var}.")
+
+    needed = {c for v in variables if v in VAR_MAP for c in VAR_MAP[v][0]}
+    src = {c: df[c].to_numpy(dtype="float64") for c in needed if c in df.columns}
+    new_cols: Dict[str, np.ndarray] = {}
+    for var in variables:
+        if var in VAR_MAP:
+            src_cols, compute = VAR_MAP[var]
+            if all(c in src for c in src_cols):
+                new_cols[var] = compute(src)
+            else:
+                print(f"Warning: {zero_fill[var]} not available {skip_note}")
+                new_cols[var] = np.zeros(len(df))
+        elif var == "TU":
+            print(f"TU (Humidity) not available {skip_note}, skipping")
+        else:
+            print(f"Variable {var} not recognized for AgriMet.")
+
+    # round every variable in one pass over a single 2-D block
+    if new_cols:
+        result_df = pd.DataFrame(np.round(np.column_stack(list(new_cols.values())), 2), columns=list(new_cols))
+    else:
+        result_df = pd.DataFrame(index=pd.RangeIndex(len(df)))
+    result_df.insert(0, "datetime", df["datetime"].to_numpy())
+    return result_df
+
+
 def _fetch_agrimet_from_api(spec: Dict[str, Any]) -> Dict[str, Any]:
     """
     Fetch AgriMet data from the USBR API instead of local files.
@@ -177,58 +368,22 @@ def _fetch_agrimet_from_api(spec: Dict[str, Any]) -> Dict[str, Any]:
     # Rename date -> datetime
     df = df.rename(columns={"date": "datetime"})
     
-    # Build result frame with requested variables
-    result_df = pd.DataFrame({"datetime": df["datetime"]})
-    
-    for var in variables:
-        if var == "OBM":
-            if "max_temp_f" not in df.columns or "min_temp_f" not in df.columns:
-                raise ValueError("API data missing temperature columns for OBM.")
-            result_df["OBM"] = ((df["max_temp_f"] + df["min_temp_f"]) / 2).round(2)
-        
-        elif var == "MX":
-            if "max_temp_f" not in df.columns:
-                raise ValueError("API data missing max_temp_f for MX.")
-            result_df["MX"] = df["max_temp_f"].round(2)
-        
-        elif var == "MN":
-            if "min_temp_f" not in df.columns:
-                raise ValueError("API data missing min_temp_f for MN.")
-            result_df["MN"] = df["min_temp_f"].round(2)
-        
-        elif var == "PC":
-            if "daily_precip_in" not in df.columns:
-                raise ValueError("API data missing daily_precip_in for PC.")
-            result_df["PC"] = (df["daily_precip_in"] * 25.4).round(2)  # inches to mm
-        
-        elif var == "SR":
-            if "solar_langley" not in df.columns:
-                print("Warning: Solar radiation not available from API")
-                result_df["SR"] = 0.0
-            else:
-                result_df["SR"] = df["solar_langley"].round(2)
-        
-        elif var == "WS":
-            if "wind_speed_mph" not in df.columns:
-                print("Warning: Wind speed not available from API")
-                result_df["WS"] = 0.0
-            else:
-                result_df["WS"] = df["wind_speed_mph"].round(2)
-        
-        elif var == "TU":
-            print("TU (Humidity) not available from API, skipping")
-        
-        else:
-            print(f"Variable {var} not recognized for AgriMet.")
+    # Build result frame with requested variables (solar/wind may be absent)
+    result_df = _build_agrimet_frame(
+        df,
+        variables,
+        source="API data",
+        skip_note="from API",
+        zero_fill={"SR": "Solar radiation", "WS": "Wind speed"},
+    )
     
     # Interval aggregation
     result_df["datetime"] = pd.to_datetime(result_df["datetime"])
     result_df = _apply_interval(result_df, interval)
     
-    records = result_df.to_dict(orient="records")
-    print(f"Loaded {len(records)} AgriMet records from API")
+    print(f"Loaded {len(result_df)} AgriMet records from API")
     
-    return {"spec": spec, "data": {"records": records}}
+    return make_payload(spec, result_df)
 
 
 def fetch_agrimet_data(spec: Dict[str, Any]) -> Dict[str, Any]:
@@ -261,71 +416,37 @@ def fetch_agrimet_data(spec: Dict[str, Any]) -> Dict[str, Any]:
 
     print(f"Loading AgriMet data from {len(csv_files)} file(s) for {location}...")
 
-    dfs = []
-    for csv_file in csv_files:
-        df_year = pd.read_csv(csv_file)
-        if "date" not in df_year.columns:
-            raise ValueError(f"AgriMet file missing 'date' column: {csv_file}")
-        df_year["date"] = pd.to_datetime(df_year["date"], errors="coerce")
-        df_year = df_year.dropna(subset=["date"])
-        dfs.append(df_year)
-
-    df = pd.concat(dfs, ignore_index=True).sort_values("date").reset_index(drop=True)
-
-    # filter by date range
-    if start_date:
-        df = df[df["date"] >= pd.to_datetime(start_date)]
-    if end_date:
-        df = df[df["date"] <= pd.to_datetime(end_date)]
+    # only read the source columns the requested variables are computed from
+    needed = {c for v in variables if v in VAR_MAP for c in VAR_MAP[v][0]}
+    # the yearly files are independent and the parsers release the GIL, so
+    # read them concurrently; map() keeps the results in file order
+    if len(csv_files) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(csv_files), AGRIMET_READ_WORKERS)) as ex:
+            dfs = list(ex.map(lambda f: _read_agrimet_csv(f, needed), csv_files))
+    else:
+        dfs = [_read_agrimet_csv(csv_file, needed) for csv_file in csv_files]
+
+    # files come in year order and each year is normally chronological, so the
+    # global sort is usually skippable; fall back to a stable mergesort if not
+    df = pd.concat(dfs, ignore_index=True)
+    if not df["date"].is_monotonic_increasing:
+        df = df.sort_values("date", kind="mergesort").reset_index(drop=True)
+
+    # filter by date range: df is sorted on date, so binary-search the bounds
+    # and take one positional slice instead of two boolean masks
+    dates = df["date"].to_numpy()
+    i0 = dates.searchsorted(_ts(start_date).asm8, side="left") if start_date else 0
+    i1 = dates.searchsorted(_ts(end_date).asm8, side="right") if end_date else len(df)
+    df = df.iloc[i0:i1]
     if df.empty:
         raise ValueError(f"No AgriMet data found for date range {start_date}..{end_date}")
 
     # rename date -> datetime
     df = df.rename(columns={"date": "datetime"})
 
-    # build result frame
-    result_df = pd.DataFrame({"datetime": df["datetime"]})
-
     # map SmartTap variable codes -> your CSV columns/transforms
     # (same logic you already had)
-    for var in variables:
-        if var == "OBM":
-            # avg temp F
-            if "max_temp_f" not in df.columns or "min_temp_f" not in df.columns:
-                raise ValueError("AgriMet CSV missing max_temp_f/min_temp_f for OBM.")
-            result_df["OBM"] = ((df["max_temp_f"] + df["min_temp_f"]) / 2).round(2)
-
-        elif var == "MX":
-            if "max_temp_f" not in df.columns:
-                raise ValueError("AgriMet CSV missing max_temp_f for MX.")
-            result_df["MX"] = df["max_temp_f"].round(2)
-
-        elif var == "MN":
-            if "min_temp_f" not in df.columns:
-                raise ValueError("AgriMet CSV missing min_temp_f for MN.")
-            result_df["MN"] = df["min_temp_f"].round(2)
-
-        elif var == "PC":
-            # precip in mm (from inches)
-            if "daily_precip_in" not in df.columns:
-                raise ValueError("AgriMet CSV missing daily_precip_in for PC.")
-            result_df["PC"] = (df["daily_precip_in"] * 25.4).round(2)
-
-        elif var == "SR":
-            if "solar_langley" not in df.columns:
-                raise ValueError("AgriMet CSV missing solar_langley for SR.")
-            result_df["SR"] = df["solar_langley"].round(2)
-
-        elif var == "WS":
-            if "wind_speed_mph" not in df.columns:
-                raise ValueError("AgriMet CSV missing wind_speed_mph for WS.")
-            result_df["WS"] = df["wind_speed_mph"].round(2)
-
-        elif var == "TU":
-            print("TU (Humidity) not available in local data, skipping")
-
-        else:
-            print(f"Variable {var} not recognized for AgriMet.")
+    result_df = _build_agrimet_frame(df, variables, source="AgriMet CSV", skip_note="in local data")
 
     # fail fast if requested variables missing
     requested = variables or []
@@ -337,14 +458,12 @@ def fetch_agrimet_data(spec: Dict[str, Any]) -> Dict[str, Any]:
             f"Present: {sorted(present)}"
         )
 
-    # interval aggregation
-    result_df["datetime"] = pd.to_datetime(result_df["datetime"])
+    # interval aggregation (datetime is datetime64 since the per-file parse)
     result_df = _apply_interval(result_df, interval)
 
-    records = result_df.to_dict(orient="records")
-    print(f"Loaded {len(records)} AgriMet records")
+    print(f"Loaded {len(result_df)} AgriMet records")
 
-    return {"spec": spec, "data": {"records": records}}
+    return make_payload(spec, result_df)
 
 
 # -------------------------
@@ -364,15 +483,194 @@ OPENET_ALIASES = {
 }
 
 
+# case-insensitive alias lookup, built once at import
+OPENET_ALIASES_CI = {k.lower(): v for k, v in OPENET_ALIASES.items()}
+
+
+@lru_cache(maxsize=256)
+def _normalize_openet_var_tuple(vars_in: tuple) -> tuple:
+    aliases = OPENET_ALIASES_CI
+    return tuple(aliases.get(v.strip().lower(), v.strip()) for v in vars_in)
+
+
 def _normalize_openet_vars(vars_in: List[str]) -> List[str]:
-    out = []
-    for v in vars_in or []:
-        if not isinstance(v, str):
-            continue
-        key = v.strip()
-        mapped = OPENET_ALIASES.get(key.lower(), key)
-        out.append(mapped)
-    return out
+    # specs repeat the same short variable lists, so cache on the str tuple
+    return list(_normalize_openet_var_tuple(tuple(v for v in vars_in or [] if isinstance(v, str))))
+
+
+def _prepare_openet_field(df: pd.DataFrame) -> pd.DataFrame:
+    if "datetime" not in df.columns:
+        raise ValueError("field_combined_long.csv must contain a 'datetime' column (from your reshaper).")
+
+    df["datetime"] = pd.to_datetime(df["datetime"], errors="coerce")
+    return df.dropna(subset=["datetime"])
+
+
+def _prepare_openet_huc(df: pd.DataFrame) -> pd.DataFrame:
+    # Ensure datetime column exists
+    if "datetime" not in df.columns:
+        if "year" in df.columns:
+            # months since 1970 -> datetime64[M] in plain numpy; missing
+            # months mean January, bad years/months become NaT
+            year = pd.to_numeric(df["year"], errors="coerce").to_numpy(dtype="float64")
+            if "month" in df.columns:
+                month = pd.to_numeric(df["month"], errors="coerce").to_numpy(dtype="float64")
+                month = np.nan_to_num(month, nan=1.0)
+            else:
+                month = np.ones(len(df))
+            valid = ~np.isnan(year) & (month >= 1) & (month <= 12)
+            months = np.where(valid, (year - 1970) * 12 + (month - 1), 0).astype("int64")
+            dt = months.astype("datetime64[M]").astype("datetime64[ns]")
+            dt[~valid] = np.datetime64("NaT")
+            df["datetime"] = dt
+        else:
+            raise ValueError("huc_combined_long.csv missing datetime and year/month columns.")
+
+    df["datetime"] = pd.to_datetime(df["datetime"], errors="coerce")
+    return df.dropna(subset=["datetime"])
+
+
+def _write_openet_cache(df: pd.DataFrame, cache_dir: Path, sort_col: Optional[str]) -> None:
+    df["year"] = df["datetime"].dt.year.astype("int32")
+    sort_keys = [c for c in (sort_col, "datetime") if c]
+    table = pa.Table.from_pandas(df.sort_values(sort_keys), preserve_index=False)
+    ds.write_dataset(
+        table,
+        cache_dir,
+        format="parquet",
+        partitioning=_openet_cache_partitioning(),
+        existing_data_behavior="overwrite_or_ignore",
+        max_rows_per_group=OPENET_CACHE_ROWS_PER_GROUP,
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+    )
+
+
+def _openet_cache_partitioning():
+    return ds.partitioning(pa.schema([("year", pa.int32())]), flavor="hive")
+
+
+def _ensure_openet_cache(csv_path: Path, prepare, sort_cols: tuple) -> Path:
+    """(Re)build the Parquet dataset for a combined-long CSV if stale; return its path."""
+    cache_dir = csv_path.with_suffix(".parquet")
+    # "_"-prefixed files are skipped by dataset discovery
+    meta_path = cache_dir / "_source.json"
+    if not cache_dir.is_dir() or not cache_is_fresh(csv_path, meta_path):
+        print(f"Caching {csv_path.name} as Parquet (one-time)...")
+        if cache_dir.is_dir():
+            shutil.rmtree(cache_dir)  # drop partitions the new CSV may no longer have
+        elif cache_dir.exists():
+            cache_dir.unlink()  # single-file cache from older versions
+        # only rebuilt with pyarrow present, so use its multi-threaded parser
+        df = prepare(pd.read_csv(csv_path, dtype=OPENET_CSV_DTYPES, engine="pyarrow"))
+        _write_openet_cache(df, cache_dir, next((c for c in sort_cols if c in df.columns), None))
+        write_cache_meta(csv_path, meta_path)
+    return cache_dir
+
+
+def build_openet_caches() -> List[Path]:
+    """
+    Build (or refresh) the Parquet datasets for whichever combined-long
+    OpenET CSVs exist, so the first query doesn't pay the conversion.
+    """
+    if ds is None:
+        raise ImportError("pyarrow is required to build the OpenET Parquet caches (pip install pyarrow)")
+
+    built = []
+    for csv_path, prepare, sort_cols in (
+        (OPENET_FIELD_COMBINED, _prepare_openet_field, OPENET_FIELD_SORT_COLS),
+        (OPENET_HUC_COMBINED, _prepare_openet_huc, OPENET_HUC_SORT_COLS),
+    ):
+        if csv_path.exists():
+            built.append(_ensure_openet_cache(csv_path, prepare, sort_cols))
+    return built
+
+
+def _load_openet_long(
+    csv_path: Path,
+    prepare,
+    id_cols: tuple,
+    id_value: Optional[str],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    var_col: Optional[str] = None,
+    variables: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None,
+    sort_cols: Optional[tuple] = None,
+) -> pd.DataFrame:
+    """
+    Load a combined-long OpenET table, keeping only rows whose id column
+    (first of `id_cols` present in the table) equals `id_value`, whose
+    datetime falls within start_date..end_date and, when `variables` is
+    given, whose `var_col` is one of them. `columns` limits the returned
+    columns (names missing from the table are ignored). `sort_cols` is the
+    cache sort key (defaults to `id_cols`).
+
+    With pyarrow installed, the prepared table is cached as a partitioned
+    Parquet dataset next to the CSV (rebuilt whenever the CSV is newer) and
+    the filters are evaluated by the dataset scanner, so years outside the
+    range are never opened. Otherwise the CSV is streamed in chunks and each
+    chunk is filtered before the matches are concatenated.
+    """
+    start = _ts(start_date)
+    end = _ts(end_date)
+
+    if ds is None:
+        # stream the CSV and keep only matching rows of each chunk, so peak
+        # memory follows the filtered size rather than the whole table;
+        # ids are read as categories so the equality filter compares codes
+        dtypes = {**OPENET_CSV_DTYPES, **{c: "category" for c in id_cols}}
+        parts = []
+        for chunk in pd.read_csv(csv_path, dtype=dtypes, chunksize=OPENET_CSV_CHUNK_ROWS):
+            df = prepare(chunk)
+            id_col = next((c for c in id_cols if c in df.columns), None)
+            mask = np.ones(len(df), dtype=bool)
+            if id_value and id_col:
+                mask &= (df[id_col] == str(id_value)).to_numpy()
+            if start is not None:
+                mask &= (df["datetime"] >= start).to_numpy()
+            if end is not None:
+                mask &= (df["datetime"] <= end).to_numpy()
+            if variables and var_col in df.columns:
+                mask &= df[var_col].isin(variables).to_numpy()
+            if columns:
+                df = df[[c for c in columns if c in df.columns]]
+            parts.append(df[mask])
+        if not parts:
+            parts.append(prepare(pd.read_csv(csv_path, dtype=dtypes, nrows=0)))
+        return pd.concat(parts, ignore_index=True)
+
+    cache_dir = _ensure_openet_cache(csv_path, prepare, sort_cols or id_cols)
+    dataset = ds.dataset(cache_dir, format="parquet", partitioning=_openet_cache_partitioning())
+    id_col = next((c for c in id_cols if c in dataset.schema.names), None)
+
+    conditions = []
+    if id_value and id_col:
+        conditions.append(ds.field(id_col) == str(id_value))
+    # the year bounds prune whole partitions; the datetime bounds skip row groups
+    if start is not None:
+        conditions.append(ds.field("year") >= start.year)
+        conditions.append(ds.field("datetime") >= start)
+    if end is not None:
+        conditions.append(ds.field("year") <= end.year)
+        conditions.append(ds.field("datetime") <= end)
+    if variables and var_col in dataset.schema.names:
+        conditions.append(ds.field(var_col).isin(variables))
+
+    expr = None
+    for cond in conditions:
+        expr = cond if expr is None else expr & cond
+    # project before materializing; filters may still use unprojected columns
+    names = [c for c in columns if c in dataset.schema.names] if columns else None
+    return dataset.to_table(columns=names, filter=expr).to_pandas()
+
+
+@lru_cache(maxsize=1)
+def _get_query_system(gpkg_path: str) -> LocationCropQuery:
+    """
+    Shared LocationCropQuery for location-based OpenET queries, so the crop
+    code table is loaded once per process rather than on every request.
+    """
+    return LocationCropQuery(full_oregon_gpkg=gpkg_path)
 
 
 def fetch_openet_data(spec: Dict[str, Any]) -> Dict[str, Any]:
@@ -418,8 +716,8 @@ def fetch_openet_data(spec: Dict[str, Any]) -> Dict[str, Any]:
         # Use full Oregon geopackage path
         full_oregon_gpkg = DATA_DIR / "preliminary_or_field_geopackage.gpkg"
         
-        # Initialize query system
-        query_system = LocationCropQuery(full_oregon_gpkg=str(full_oregon_gpkg))
+        # Reuse the query system across calls
+        query_system = _get_query_system(str(full_oregon_gpkg))
         
         # Query each variable and combine results
         all_results = {}  # Changed to dict to track which variable each result is for
@@ -467,18 +765,11 @@ def fetch_openet_data(spec: Dict[str, Any]) -> Dict[str, Any]:
                     f"Try: Benton, Marion, Klamath, Hood River, Umatilla, Malheur, etc."
                 )
         
-        # Merge all variables on datetime
-        first_var = list(all_results.keys())[0]
-        wide = all_results[first_var][['datetime', first_var]].copy()
-        
-        for var in list(all_results.keys())[1:]:
-            wide = wide.merge(
-                all_results[var][['datetime', var]],
-                on='datetime',
-                how='outer'
-            )
-        
-        wide = wide.sort_values('datetime').reset_index(drop=True)
+        # Align all variables on datetime in a single outer concat
+        frames = [df_var.set_index('datetime')[[var]] for var, df_var in all_results.items()]
+        wide = pd.concat(frames, axis=1, join='outer').sort_index()
+        wide.index.name = 'datetime'
+        wide = wide.reset_index()
 
     # -------------------
     # FIELD
@@ -488,30 +779,16 @@ def fetch_openet_data(spec: Dict[str, Any]) -> Dict[str, Any]:
             OPENET_FIELD_COMBINED,
             "Create it by running: python combine_openet_field.py (expects field_long_out/*_field_long.csv first).",
         )
-        df = pd.read_csv(OPENET_FIELD_COMBINED)
-
-        if "datetime" not in df.columns:
-            raise ValueError("field_combined_long.csv must contain a 'datetime' column (from your reshaper).")
-
-        df["datetime"] = pd.to_datetime(df["datetime"], errors="coerce")
-        df = df.dropna(subset=["datetime"])
-
-        # filter by OPENET_ID if provided
-        openet_id = spec.get("openet_id") or spec.get("OPENET_ID")
-        if openet_id and "OPENET_ID" in df.columns:
-            df = df[df["OPENET_ID"].astype(str) == str(openet_id)]
-
-        # filter date range
-        if start_date:
-            df = df[df["datetime"] >= pd.to_datetime(start_date)]
-        if end_date:
-            df = df[df["datetime"] <= pd.to_datetime(end_date)]
-
+        # filter by OPENET_ID (if provided), date range and variables;
         # field long uses column "variable"
-        if variables:
-            if "variable" not in df.columns:
-                raise ValueError("field_combined_long.csv must contain 'variable' and 'value' columns.")
-            df = df[df["variable"].isin(variables)]
+        openet_id = spec.get("openet_id") or spec.get("OPENET_ID")
+        df = _load_openet_long(
+            OPENET_FIELD_COMBINED, _prepare_openet_field, ("OPENET_ID",), openet_id, start_date, end_date,
+            var_col="variable", variables=variables, columns=["datetime", "variable", "value"],
+            sort_cols=OPENET_FIELD_SORT_COLS,
+        )
+        if variables and "variable" not in df.columns:
+            raise ValueError("field_combined_long.csv must contain 'variable' and 'value' columns.")
 
         if df.empty:
             raise ValueError("No OpenET FIELD data after filters (openet_id/variables/date range).")
@@ -526,45 +803,21 @@ def fetch_openet_data(spec: Dict[str, Any]) -> Dict[str, Any]:
             OPENET_HUC_COMBINED,
             "Create it by running: python combine_openet_huc.py (expects openet_exports/*_long.csv first).",
         )
-        df = pd.read_csv(OPENET_HUC_COMBINED)
-
-        # Ensure datetime column exists
-        if "datetime" not in df.columns:
-            if "year" in df.columns:
-                df["month"] = pd.to_numeric(df.get("month", 1), errors="coerce").fillna(1).astype(int)
-                df["year"] = pd.to_numeric(df["year"], errors="coerce").astype(int)
-                df["datetime"] = pd.to_datetime(dict(year=df["year"], month=df["month"], day=1), errors="coerce")
-            else:
-                raise ValueError("huc_combined_long.csv missing datetime and year/month columns.")
-
-        df["datetime"] = pd.to_datetime(df["datetime"], errors="coerce")
-        df = df.dropna(subset=["datetime"])
-
-        # filter by HUC code
+        # filter by HUC code, date range and variables
         if geo == "huc8":
             code = spec.get("huc8_code") or spec.get("HUC8_code") or spec.get("HUC8")
-            if code:
-                col = "HUC8_code" if "HUC8_code" in df.columns else "HUC8"
-                if col in df.columns:
-                    df = df[df[col].astype(str) == str(code)]
+            code_cols = ("HUC8_code", "HUC8")
         else:
             code = spec.get("huc12_code") or spec.get("HUC12_code") or spec.get("HUC12")
-            if code:
-                col = "HUC12_code" if "HUC12_code" in df.columns else "HUC12"
-                if col in df.columns:
-                    df = df[df[col].astype(str) == str(code)]
-
-        # filter date range
-        if start_date:
-            df = df[df["datetime"] >= pd.to_datetime(start_date)]
-        if end_date:
-            df = df[df["datetime"] <= pd.to_datetime(end_date)]
-
+            code_cols = ("HUC12_code", "HUC12")
         # huc long uses column "metric"
-        if variables:
-            if "metric" not in df.columns:
-                raise ValueError("huc_combined_long.csv must contain 'metric' and 'value' columns.")
-            df = df[df["metric"].isin(variables)]
+        df = _load_openet_long(
+            OPENET_HUC_COMBINED, _prepare_openet_huc, code_cols, code, start_date, end_date,
+            var_col="metric", variables=variables, columns=["datetime", "metric", "value"],
+            sort_cols=OPENET_HUC_SORT_COLS,
+        )
+        if variables and "metric" not in df.columns:
+            raise ValueError("huc_combined_long.csv must contain 'metric' and 'value' columns.")
 
         if df.empty:
             raise ValueError("No OpenET HUC data after filters (huc code/variables/date range).")
@@ -575,31 +828,90 @@ def fetch_openet_data(spec: Dict[str, Any]) -> Dict[str, Any]:
     wide["datetime"] = pd.to_datetime(wide["datetime"])
     wide = _apply_interval(wide, interval)
 
-    records = wide.to_dict(orient="records")
-    print(f"Loaded {len(records)} OpenET records ({geo})")
+    print(f"Loaded {len(wide)} OpenET records ({geo})")
 
-    return {"spec": spec, "data": {"records": records}}
+    return make_payload(spec, wide)
 
 
 # -------------------------
 # Router
 # -------------------------
 
-def fetch_data(spec: Dict[str, Any]) -> Dict[str, Any]:
+def _mtime(path: Path) -> Optional[float]:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _source_mtimes(dataset: str, spec: Dict[str, Any]) -> tuple:
+    """(path, mtime) of the local sources a fetch for `spec` reads (cache key part)."""
+    if dataset == "openet":
+        paths = [
+            OPENET_FIELD_COMBINED,
+            OPENET_HUC_COMBINED,
+            DATA_DIR / "field_points.gpkg",
+            DATA_DIR / "preliminary_or_field_geopackage.gpkg",
+        ]
+    else:
+        # the exact yearly files in range, so editing one (or adding a
+        # missing year) changes the key
+        location = (spec.get("location", "corvallis") or "corvallis").lower().strip()
+        paths = get_data_files_for_range(location, spec.get("start_date"), spec.get("end_date"))
+    return tuple((str(p), _mtime(p)) for p in paths)
+
+
+@lru_cache(maxsize=128)
+def _fetch_data_cached(dataset: str, spec_json: str, source_mtimes: tuple) -> pd.DataFrame:
+    # source_mtimes is only part of the key: a changed source file misses the cache.
+    # The cache keeps its own copy of the result frame; each hit wraps it in a
+    # new payload, so no caller can modify what the next one receives.
+    return payload_frame(_fetch_uncached(dataset, json.loads(spec_json)))
+
+
+def _fetch_uncached(dataset: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+    if dataset == "openet":
+        return fetch_openet_data(spec)
+    return fetch_agrimet_data(spec)
+
+
+def fetch_data(spec: Dict[str, Any], payload_format: str = "records") -> Dict[str, Any]:
     """
     Main data fetching function that routes to appropriate data source.
+
+    Results from local files are memoized per spec (and source file mtimes),
+    so re-issuing the same spec skips the load entirely. Every call gets its
+    own records; the column arrays are read-only.
+
+    payload_format="columns" returns only payload.data.columns (no records
+    view) for consumers that work column-wise.
     """
     if spec.get("task") == "error":
         raise ValueError(f"Error in spec: {spec.get('error_message')}")
 
+    if payload_format not in {"records", "columns"}:
+        raise ValueError(f"payload_format must be 'records' or 'columns', got: {payload_format}")
+
     dataset = (spec.get("dataset") or "agrimet").lower().strip()
 
-    if dataset == "openet":
-        return fetch_openet_data(spec)
-    if dataset == "agrimet":
-        return fetch_agrimet_data(spec)
+    if dataset not in {"openet", "agrimet"}:
+        raise ValueError(f"Unknown dataset: {dataset}")
+
+    # API results can change between calls, so they are never cached
+    if dataset == "agrimet" and USE_AGRIMET_API:
+        payload = fetch_agrimet_data(spec)
+    else:
+        try:
+            spec_json = json.dumps(spec, sort_keys=True)
+        except (TypeError, ValueError):
+            # spec values that don't serialize can't form a key; fetch uncached
+            payload = _fetch_uncached(dataset, spec)
+        else:
+            payload = make_payload(spec, _fetch_data_cached(dataset, spec_json, _source_mtimes(dataset, spec)))
 
-    raise ValueError(f"Unknown dataset: {dataset}")
+    if payload_format == "columns":
+        return {"spec": payload["spec"], "data": {"columns": payload["data"]["columns"]}}
+    return payload
 
 
 # -------------------------
@@ -7,13 +7,121 @@ Extended to support OpenET variable queries by location:
 - "What is the irrigation water applied to wheat fields in Hood River?"
 """
 
+import json
+import re
 import sqlite3
+import threading
+import warnings
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from collections import Counter
 from datetime import datetime
 
+from .cache_meta import cache_is_fresh, write_cache_meta
+
+# pyarrow's multithreaded CSV parser is used for CROP.csv when available
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Value lists are bound as one JSON array parameter, so the SQL text (and
+# SQLite's prepared statement) is the same whatever the list length, and
+# long OPENET_ID lists never hit SQLite's bound-variable limit
+IN_LIST = "IN (SELECT value FROM json_each(?))"
+
+
+def _json_list(values) -> str:
+    """Bind value for IN_LIST"""
+    return json.dumps(list(values))
+
+
+# Lookup columns of field_points. NOCASE matches the case-insensitive
+# matching the queries use, so `col = ? COLLATE NOCASE` can seek the index.
+FIELD_POINT_INDEXES = {
+    "idx_fp_city1": "Nearest_City_1 COLLATE NOCASE",
+    "idx_fp_city2": "Nearest_City_2 COLLATE NOCASE",
+    "idx_fp_county": "County COLLATE NOCASE",
+    "idx_fp_openet_id": "OPENET_ID",
+}
+
+
+# Page cache per connection, in KiB (negative cache_size = KiB, not pages)
+SQLITE_CACHE_KIB = 256 * 1024
+# Upper bound on the memory-mapped region; capped further by the file size
+SQLITE_MMAP_MAX = 1 << 30
+
+
+def _tune_read_connection(conn: sqlite3.Connection, path: Path):
+    """
+    PRAGMAs for the read-only GeoPackage workload: a large page cache, reads
+    through mmap instead of read() syscalls, in-memory temp b-trees (IN lists,
+    ORDER BY), and query_only so nothing can write to the data files.
+    """
+    try:
+        mmap_size = min(Path(path).stat().st_size, SQLITE_MMAP_MAX)
+    except OSError:
+        mmap_size = 0
+    conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_KIB}")
+    conn.execute(f"PRAGMA mmap_size={mmap_size}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA query_only=1")
+
+
+# OpenET variable names double as table names in the GeoPackage
+TABLE_NAME_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+# Columns callers may select from find_fields_by_* (also guards the SQL text)
+FIELD_POINT_COLUMNS = frozenset({
+    "OPENET_ID", "County", "Nearest_City_1", "Nearest_City_2",
+    "Longitude", "Latitude", "Dist_City_1_ft", "Dist_City_2_ft",
+})
+
+# City/county lookups remembered per instance (least recently used dropped first)
+FIELD_LOOKUP_CACHE_SIZE = 64
+
+
+def _check_field_columns(columns) -> Optional[Tuple[str, ...]]:
+    """Normalize a find_fields_by_* column selection to a hashable tuple"""
+    if not columns:
+        return None
+    columns = tuple(columns)
+    unknown = [c for c in columns if c not in FIELD_POINT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown field_points columns: {unknown}")
+    return columns
+
+
+def _name_filter(conn, column: str, name: str) -> Tuple[str, str]:
+    """
+    The (`op`, bind value) pair _match_name would settle on for `column`:
+    exact case-insensitive when any field_points row matches exactly,
+    otherwise substring LIKE.
+    """
+    exact = conn.execute(
+        f"SELECT 1 FROM field_points WHERE {column} = ? COLLATE NOCASE LIMIT 1", (name,)
+    ).fetchone()
+    if exact:
+        return "= ? COLLATE NOCASE", name
+    return "LIKE ?", f"%{name}%"
+
+
+def _match_name(conn, query: str, name: str) -> pd.DataFrame:
+    """
+    Run a field_points query whose name filter is written as `<col> {op}`.
+    Tries an exact case-insensitive match first (an index seek), and falls back
+    to the substring match `LIKE '%name%'` (full scan) only when that finds nothing.
+    """
+    df = pd.read_sql_query(query.format(op="= :name COLLATE NOCASE"), conn,
+                           params={"name": name})
+    if df.empty:
+        df = pd.read_sql_query(query.format(op="LIKE :name"), conn,
+                               params={"name": f"%{name}%"})
+    return df
+
+
 class LocationCropQuery:
     """Query crops by location using field_points.gpkg and CROP data"""
     
@@ -43,27 +151,168 @@ class LocationCropQuery:
         else:
             self.crop_source = "csv"
             self.crop_csv = base_path / "data" / "archive" / "openet_csv_out" / "CROP.csv"
+            self._crop_csv_df = None
+            self._crop_csv_ids = None
             print(f"Using CSV crop data (Klamath subset only)")
             print(f"Note: To query all Oregon, extract data/archive/preliminary_or_field_geopackage.7z")
         
+        # One connection per GeoPackage for the life of the instance, shared by
+        # all queries (the instance may be cached and reused across threads)
+        self._fp_conn = sqlite3.connect(self.field_points_gpkg, check_same_thread=False)
+        self._crop_conn = (sqlite3.connect(self.crop_gpkg, check_same_thread=False)
+                           if self.crop_source == "geopackage" else None)
+        if self._crop_conn is not None:
+            # lets crop queries join field_points directly (schema "fp")
+            self._crop_conn.execute("ATTACH DATABASE ? AS fp", (str(self.field_points_gpkg),))
+        
+        # variable table -> column names, filled on first use
+        self._var_columns: Dict[str, frozenset] = {}
+        
+        # Repeat city/county lookups are served from memory; the public
+        # methods hand out copies so callers can't alter the cached frames.
+        # Plain dicts rather than lru_cache on bound methods, which would
+        # make a self-reference cycle and keep __del__ from closing promptly
+        self._city_lookups: Dict[tuple, pd.DataFrame] = {}
+        self._county_lookups: Dict[tuple, pd.DataFrame] = {}
+        self._lookup_lock = threading.Lock()
+        
         # Load CDL crop codes for name lookup
         self.crop_names = self._load_crop_names()
+        # code -> name/group lookups for annotating whole crop_code columns
+        self._name_map = pd.Series({c: info['name'] for c, info in self.crop_names.items()}, dtype=object)
+        self._group_map = pd.Series({c: info['group'] for c, info in self.crop_names.items()}, dtype=object)
+        # lowercased names (and their plural-stripped forms) for _match_crop
+        self._codes_arr = np.array(list(self.crop_names.keys()), dtype=np.int64)
+        self._names_lower = np.array([info['name'].lower() for info in self.crop_names.values()], dtype=str)
+        self._names_lower_stripped = np.char.rstrip(self._names_lower, 's')
+        
+        self._ensure_field_point_indexes()
+        # after the index build, the only write this class does
+        _tune_read_connection(self._fp_conn, self.field_points_gpkg)
+        if self._crop_conn is not None:
+            _tune_read_connection(self._crop_conn, self.crop_gpkg)
+    
+    def close(self):
+        """Close the GeoPackage connections"""
+        for conn in (self._fp_conn, self._crop_conn):
+            if conn is not None:
+                conn.close()
+        self._fp_conn = self._crop_conn = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def __del__(self):
+        if getattr(self, '_fp_conn', None) is not None:
+            self.close()
+    
+    def _memoized(self, memo: Dict[tuple, pd.DataFrame], compute, *key) -> pd.DataFrame:
+        """compute(*key), remembered in memo (an LRU of FIELD_LOOKUP_CACHE_SIZE entries)"""
+        with self._lookup_lock:
+            if key in memo:
+                memo[key] = memo.pop(key)  # mark most recently used
+                return memo[key]
+        df = compute(*key)
+        with self._lookup_lock:
+            memo[key] = df
+            while len(memo) > FIELD_LOOKUP_CACHE_SIZE:
+                memo.pop(next(iter(memo)))
+        return df
+    
+    def _ensure_field_point_indexes(self):
+        """Create the field_points lookup indexes once (no-op when they exist)"""
+        try:
+            for name, cols in FIELD_POINT_INDEXES.items():
+                self._fp_conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON field_points({cols})")
+            self._fp_conn.commit()
+        except sqlite3.Error as e:
+            # read-only copy or missing table: queries still work, just scan
+            print(f"Warning: Could not index field_points: {e}")
     
     def _load_crop_names(self) -> Dict[int, Dict]:
-        """Load CDL crop code to name mapping"""
+        """
+        Load CDL crop code to name mapping. The parsed dict is saved as JSON
+        next to the CSV and reused until the CSV's mtime or size changes.
+        """
+        cache_path = self.cdl_codes_csv.with_suffix('.json')
+        meta_path = cache_path.with_suffix('.meta.json')
+        try:
+            if cache_path.exists() and cache_is_fresh(self.cdl_codes_csv, meta_path):
+                with open(cache_path) as f:
+                    return {int(code): info for code, info in json.load(f).items()}
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring crop name cache: {e}")
+        
         try:
-            df = pd.read_csv(self.cdl_codes_csv)
-            mapping = {}
-            for _, row in df.iterrows():
-                mapping[int(row['CDL_Code'])] = {
-                    'name': row['Crop_Name'],
-                    'group': row.get('Crop_Group', 'Unknown'),
-                    'type': row.get('Annual_Perennial', 'Unknown')
-                }
-            return mapping
+            df = pd.read_csv(self.cdl_codes_csv, dtype={'Crop_Name': str, 'Crop_Group': str,
+                                                        'Annual_Perennial': str})
+            n = len(df)
+            groups = df['Crop_Group'].tolist() if 'Crop_Group' in df.columns else ['Unknown'] * n
+            types = df['Annual_Perennial'].tolist() if 'Annual_Perennial' in df.columns else ['Unknown'] * n
+            mapping = {
+                int(code): {'name': name, 'group': group, 'type': kind}
+                for code, name, group, kind in zip(df['CDL_Code'].tolist(),
+                                                   df['Crop_Name'].tolist(), groups, types)
+            }
         except Exception as e:
             print(f"Warning: Could not load crop names: {e}")
             return {}
+        
+        try:
+            with open(cache_path, 'w') as f:
+                json.dump(mapping, f)
+            write_cache_meta(self.cdl_codes_csv, meta_path)
+        except OSError as e:
+            print(f"Warning: Could not cache crop names: {e}")
+        return mapping
+    
+    def _table_columns(self, table: str) -> frozenset:
+        """Column names of a crop GeoPackage table (PRAGMA table_info, once per table)"""
+        if table not in self._var_columns:
+            if not TABLE_NAME_RE.fullmatch(table):
+                raise ValueError(f"invalid table name {table!r}")
+            rows = self._crop_conn.execute(f"PRAGMA table_info({table})").fetchall()
+            self._var_columns[table] = frozenset(row[1] for row in rows)
+        return self._var_columns[table]
+    
+    def _load_crop_csv(self) -> pd.DataFrame:
+        """
+        CROP.csv, loaded once per instance. With pyarrow installed it goes
+        through a Parquet copy (CROP.parquet next to the CSV, rebuilt when the
+        CSV's mtime or size changes); otherwise the CSV is parsed directly.
+        OPENET_ID is read as text; crop columns keep their inferred types.
+        The frame is shared between calls and must not be modified in place.
+        """
+        if self._crop_csv_df is None:
+            if pa is not None:
+                df = self._read_crop_parquet()
+            else:
+                df = pd.read_csv(self.crop_csv, dtype={'OPENET_ID': str})
+            self._crop_csv_df = df
+            self._crop_csv_ids = pd.Index(df['OPENET_ID'])
+        return self._crop_csv_df
+    
+    def _read_crop_parquet(self) -> pd.DataFrame:
+        parquet_path = self.crop_csv.with_suffix('.parquet')
+        meta_path = parquet_path.with_suffix('.meta.json')
+        try:
+            if parquet_path.exists() and cache_is_fresh(self.crop_csv, meta_path):
+                return pd.read_parquet(parquet_path)
+        except (OSError, pa.ArrowException) as e:
+            print(f"Warning: Ignoring {parquet_path.name}: {e}")
+        
+        df = pd.read_csv(self.crop_csv, engine="pyarrow", dtype={'OPENET_ID': str})
+        try:
+            # the writer dictionary-encodes OPENET_ID and the low-cardinality
+            # crop code columns on its own
+            df.to_parquet(parquet_path, index=False, compression="zstd")
+            write_cache_meta(self.crop_csv, meta_path)
+        except OSError as e:
+            print(f"Warning: Could not cache {self.crop_csv.name} as Parquet: {e}")
+        return df
     
     def get_crop_name(self, cdl_code: int) -> str:
         """Get crop name from CDL code"""
@@ -71,58 +320,104 @@ class LocationCropQuery:
             return self.crop_names[cdl_code]['name']
         return f"Unknown (CDL {cdl_code})"
     
-    def find_fields_by_city(self, city_name: str, max_distance: int = 1) -> pd.DataFrame:
+    def _crop_names_for(self, codes: pd.Series) -> pd.Series:
+        """get_crop_name over a whole column (one hash lookup per row)"""
+        known = codes.isin(self._name_map.index)
+        return codes.map(self._name_map).where(known, "Unknown (CDL " + codes.astype(str) + ")")
+    
+    def _match_crop(self, text: str, fuzzy: bool = True) -> List[int]:
+        """
+        CDL codes whose (lowercased) name contains `text`. With fuzzy matching a
+        code also matches when its name is contained in `text`, or either side
+        matches with a trailing 's' stripped (handles singular/plural, e.g.
+        "cherry" vs "Cherries", "wheat" vs "Winter Wheat").
+        """
+        if not len(self._codes_arr):
+            return []
+        text = text.lower()
+        names = self._names_lower
+        mask = np.char.find(names, text) >= 0
+        if fuzzy:
+            mask |= np.char.find(text, names) >= 0
+            mask |= np.char.find(names, text.rstrip('s')) >= 0
+            mask |= np.char.find(text, self._names_lower_stripped) >= 0
+        return self._codes_arr[mask].tolist()
+    
+    def _crop_groups_for(self, codes: pd.Series) -> pd.Series:
+        """Crop group per code, 'Unknown' for codes missing from the CDL table"""
+        known = codes.isin(self._group_map.index)
+        return codes.map(self._group_map).where(known, 'Unknown')
+    
+    def find_fields_by_city(self, city_name: str, max_distance: int = 1,
+                            columns: Optional[Tuple[str, ...]] = None) -> pd.DataFrame:
         """
         Find all fields near a city
         
         Args:
             city_name: Name of the city
             max_distance: 1 = nearest city only, 2 = include second nearest
+            columns: Only return these field_points columns (e.g. ("OPENET_ID",));
+                     default is all of them plus the distance column
         
         Returns:
             DataFrame with OPENET_ID, County, Nearest_City_1, Nearest_City_2, Lat, Lon
         """
-        conn = sqlite3.connect(self.field_points_gpkg)
+        columns = _check_field_columns(columns)
+        return self._memoized(self._city_lookups, self._fields_by_city,
+                              city_name, max_distance, columns).copy()
+    
+    def _fields_by_city(self, city_name: str, max_distance: int,
+                        columns: Optional[Tuple[str, ...]]) -> pd.DataFrame:
+        conn = self._fp_conn
         
         if max_distance == 1:
+            select = ", ".join(columns) if columns else """OPENET_ID, County, Nearest_City_1, Nearest_City_2, 
+                   Longitude, Latitude, Dist_City_1_ft"""
             query = f"""
-            SELECT OPENET_ID, County, Nearest_City_1, Nearest_City_2, 
-                   Longitude, Latitude, Dist_City_1_ft
+            SELECT {select}
             FROM field_points
-            WHERE Nearest_City_1 LIKE '%{city_name}%'
+            WHERE Nearest_City_1 {{op}}
             ORDER BY Dist_City_1_ft
             """
         else:
-            query = f"""
-            SELECT OPENET_ID, County, Nearest_City_1, Nearest_City_2,
-                   Longitude, Latitude, 
-                   CASE 
-                       WHEN Nearest_City_1 LIKE '%{city_name}%' THEN Dist_City_1_ft
+            distance = """CASE 
+                       WHEN Nearest_City_1 {op} THEN Dist_City_1_ft
                        ELSE Dist_City_2_ft
-                   END as Distance_ft
+                   END"""
+            select = ", ".join(columns) if columns else f"""OPENET_ID, County, Nearest_City_1, Nearest_City_2,
+                   Longitude, Latitude, 
+                   {distance} as Distance_ft"""
+            query = f"""
+            SELECT {select}
             FROM field_points
-            WHERE Nearest_City_1 LIKE '%{city_name}%' 
-               OR Nearest_City_2 LIKE '%{city_name}%'
-            ORDER BY Distance_ft
+            WHERE Nearest_City_1 {{op}} 
+               OR Nearest_City_2 {{op}}
+            ORDER BY {distance if columns else "Distance_ft"}
             """
         
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        df = _match_name(conn, query, city_name)
         return df
     
-    def find_fields_by_county(self, county_name: str) -> pd.DataFrame:
-        """Find all fields in a county"""
-        conn = sqlite3.connect(self.field_points_gpkg)
+    def find_fields_by_county(self, county_name: str,
+                              columns: Optional[Tuple[str, ...]] = None) -> pd.DataFrame:
+        """Find all fields in a county (optionally only the given columns)"""
+        columns = _check_field_columns(columns)
+        return self._memoized(self._county_lookups, self._fields_by_county,
+                              county_name, columns).copy()
+    
+    def _fields_by_county(self, county_name: str,
+                          columns: Optional[Tuple[str, ...]]) -> pd.DataFrame:
+        conn = self._fp_conn
         
+        select = ", ".join(columns) if columns else """OPENET_ID, County, Nearest_City_1, Nearest_City_2,
+               Longitude, Latitude"""
         query = f"""
-        SELECT OPENET_ID, County, Nearest_City_1, Nearest_City_2,
-               Longitude, Latitude
+        SELECT {select}
         FROM field_points
-        WHERE County LIKE '%{county_name}%'
+        WHERE County {{op}}
         """
         
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        df = _match_name(conn, query, county_name)
         return df
     
     def get_crops_for_fields(self, openet_ids: List[str], year: int = 2024) -> pd.DataFrame:
@@ -138,19 +433,19 @@ class LocationCropQuery:
         """
         if self.crop_source == "geopackage":
             # Query from geopackage
-            conn = sqlite3.connect(self.crop_gpkg)
+            conn = self._crop_conn
             crop_col = f'CROP_{year}'
             
             # Build query for subset of IDs
-            ids_str = "', '".join(openet_ids)
+            ids_param = (_json_list(str(i) for i in openet_ids),)
             query = f"""
             SELECT OPENET_ID, {crop_col} as crop_code
             FROM CROP
-            WHERE OPENET_ID IN ('{ids_str}')
+            WHERE OPENET_ID {IN_LIST}
             """
             
             try:
-                crop_df = pd.read_sql_query(query, conn)
+                crop_df = pd.read_sql_query(query, conn, params=ids_param)
             except Exception as e:
                 # Try most recent year if specified year not available
                 available_cols = pd.read_sql_query("SELECT * FROM CROP LIMIT 1", conn).columns
@@ -161,20 +456,23 @@ class LocationCropQuery:
                     query = f"""
                     SELECT OPENET_ID, {crop_col} as crop_code
                     FROM CROP
-                    WHERE OPENET_ID IN ('{ids_str}')
+                    WHERE OPENET_ID {IN_LIST}
                     """
-                    crop_df = pd.read_sql_query(query, conn)
+                    crop_df = pd.read_sql_query(query, conn, params=ids_param)
                 else:
-                    conn.close()
                     return pd.DataFrame()
-            
-            conn.close()
         else:
             # Load from CSV (Klamath subset only)
-            crop_df = pd.read_csv(self.crop_csv)
+            crop_df = self._load_crop_csv()
             
-            # Filter to requested fields
-            crop_df = crop_df[crop_df['OPENET_ID'].isin(openet_ids)]
+            # Filter to requested fields: look the ids up in the OPENET_ID
+            # index (O(len(ids))) instead of scanning every row, keeping file order
+            id_index = self._crop_csv_ids
+            if id_index.is_unique:
+                pos = id_index.get_indexer(pd.unique(pd.Index(list(openet_ids), dtype=object)))
+                crop_df = crop_df.iloc[np.sort(pos[pos >= 0])]
+            else:
+                crop_df = crop_df[crop_df['OPENET_ID'].isin(openet_ids)]
             
             # Get crop column for the year
             crop_col = f'CROP_{year}'
@@ -228,10 +526,8 @@ class LocationCropQuery:
             return pd.DataFrame()
         
         # Step 3: Add crop names
-        crops['crop_name'] = crops['crop_code'].apply(self.get_crop_name)
-        crops['crop_group'] = crops['crop_code'].apply(
-            lambda x: self.crop_names.get(x, {}).get('group', 'Unknown')
-        )
+        crops['crop_name'] = self._crop_names_for(crops['crop_code'])
+        crops['crop_group'] = self._crop_groups_for(crops['crop_code'])
         
         # Step 4: Join with field location data
         result = crops.merge(fields, on='OPENET_ID', how='left')
@@ -257,10 +553,8 @@ class LocationCropQuery:
             return pd.DataFrame()
         
         # Step 3: Add crop names
-        crops['crop_name'] = crops['crop_code'].apply(self.get_crop_name)
-        crops['crop_group'] = crops['crop_code'].apply(
-            lambda x: self.crop_names.get(x, {}).get('group', 'Unknown')
-        )
+        crops['crop_name'] = self._crop_names_for(crops['crop_code'])
+        crops['crop_group'] = self._crop_groups_for(crops['crop_code'])
         
         # Step 4: Join with field data
         result = crops.merge(fields, on='OPENET_ID', how='left')
@@ -310,12 +604,7 @@ class LocationCropQuery:
             DataFrame with fields growing that crop
         """
         # Find matching crop codes
-        matching_codes = []
-        crop_name_lower = crop_name.lower()
-        
-        for code, info in self.crop_names.items():
-            if crop_name_lower in info['name'].lower():
-                matching_codes.append(code)
+        matching_codes = self._match_crop(crop_name, fuzzy=False)
         
         if not matching_codes:
             print(f"No crop found matching '{crop_name}'")
@@ -328,28 +617,30 @@ class LocationCropQuery:
         crop_col = f'CROP_{year}'
         
         if self.crop_source == "geopackage":
-            conn = sqlite3.connect(self.crop_gpkg)
-            
-            # Build query for matching crop codes
-            codes_str = ", ".join(str(c) for c in matching_codes)
+            conn = self._crop_conn
             
+            # Join CROP to the attached field_points in one query. The county
+            # test sits in the ON clause of a LEFT JOIN so crop matches outside
+            # the county still come back (fp_id NULL): that separates "nobody
+            # grows it" from "nobody grows it in this county"
+            params = [_json_list(int(c) for c in matching_codes)]
+            county_on = ""
             if county:
-                # Join with field_points for county filter - use subquery
-                query = f"""
-                SELECT OPENET_ID, {crop_col} as crop_code
-                FROM CROP
-                WHERE {crop_col} IN ({codes_str})
-                """
-            else:
-                query = f"""
-                SELECT OPENET_ID, {crop_col} as crop_code
-                FROM CROP
-                WHERE {crop_col} IN ({codes_str})
-                """
+                op, county_param = _name_filter(self._fp_conn, "County", county)
+                county_on = f" AND f.County {op}"
+                params.insert(0, county_param)
+            
+            query = f"""
+            SELECT c.OPENET_ID, c.{crop_col} as crop_code,
+                   f.County, f.Nearest_City_1, f.Longitude, f.Latitude,
+                   f.OPENET_ID as fp_id
+            FROM CROP c
+            LEFT JOIN fp.field_points f ON f.OPENET_ID = c.OPENET_ID{county_on}
+            WHERE c.{crop_col} {IN_LIST}
+            """
             
             try:
-                crop_df = pd.read_sql_query(query, conn)
-                crop_df.rename(columns={crop_col: 'crop_code'}, inplace=True)
+                joined = pd.read_sql_query(query, conn, params=params)
             except Exception as e:
                 # Try most recent year
                 available_cols = pd.read_sql_query("SELECT * FROM CROP LIMIT 1", conn).columns
@@ -358,50 +649,52 @@ class LocationCropQuery:
                     crop_col = sorted(crop_years)[-1]
                     print(f"Using {crop_col}")
                     query = query.replace(f'CROP_{year}', crop_col)
-                    crop_df = pd.read_sql_query(query, conn)
-                    crop_df.rename(columns={crop_col: 'crop_code'}, inplace=True)
+                    joined = pd.read_sql_query(query, conn, params=params)
                 else:
-                    conn.close()
                     return pd.DataFrame()
             
-            conn.close()
+            if joined.empty:
+                print(f"No fields found growing {crop_name} in {year}")
+                return pd.DataFrame()
+            
+            located = joined['fp_id'].notna().to_numpy()
+            result = joined[located].drop(columns='fp_id').reset_index(drop=True)
         else:
             # Load from CSV
-            crop_df = pd.read_csv(self.crop_csv)
+            crop_df = self._load_crop_csv()
             
             if crop_col not in crop_df.columns:
                 available_years = [col for col in crop_df.columns if col.startswith('CROP_')]
                 crop_col = sorted(available_years)[-1]
                 print(f"Using {crop_col}")
             
-            # Filter to matching crops
-            crop_df[crop_col] = pd.to_numeric(crop_df[crop_col], errors='coerce')
-            crop_df = crop_df[crop_df[crop_col].isin(matching_codes)]
-            crop_df = crop_df[['OPENET_ID', crop_col]].copy()
-            crop_df.rename(columns={crop_col: 'crop_code'}, inplace=True)
-        
-        if crop_df.empty:
-            print(f"No fields found growing {crop_name} in {year}")
-            return pd.DataFrame()
-        
-        # Get field locations
-        conn = sqlite3.connect(self.field_points_gpkg)
-        
-        if county:
-            query = f"""
-            SELECT OPENET_ID, County, Nearest_City_1, Longitude, Latitude
-            FROM field_points
-            WHERE County LIKE '%{county}%'
-            """
-        else:
-            query = "SELECT OPENET_ID, County, Nearest_City_1, Longitude, Latitude FROM field_points"
-        
-        fields_df = pd.read_sql_query(query, conn)
-        conn.close()
+            # Filter to matching crops (the loaded table is shared, don't modify it)
+            codes = pd.to_numeric(crop_df[crop_col], errors='coerce')
+            keep = codes.isin(matching_codes)
+            crop_df = pd.DataFrame({'OPENET_ID': crop_df['OPENET_ID'][keep], 'crop_code': codes[keep]})
+            
+            if crop_df.empty:
+                print(f"No fields found growing {crop_name} in {year}")
+                return pd.DataFrame()
+            
+            # Get field locations
+            conn = self._fp_conn
+            
+            if county:
+                query = """
+                SELECT OPENET_ID, County, Nearest_City_1, Longitude, Latitude
+                FROM field_points
+                WHERE County {op}
+                """
+                fields_df = _match_name(conn, query, county)
+            else:
+                query = "SELECT OPENET_ID, County, Nearest_City_1, Longitude, Latitude FROM field_points"
+                fields_df = pd.read_sql_query(query, conn)
+            
+            # Join
+            result = crop_df.merge(fields_df, on='OPENET_ID', how='inner')
         
-        # Join
-        result = crop_df.merge(fields_df, on='OPENET_ID', how='inner')
-        result['crop_name'] = result['crop_code'].apply(self.get_crop_name)
+        result['crop_name'] = self._crop_names_for(result['crop_code'])
         
         print(f"Found {len(result)} fields growing {crop_name}" + 
               (f" in {county} County" if county else ""))
@@ -428,6 +721,10 @@ class LocationCropQuery:
             print("Extract data/preliminary_or_field_geopackage.7z to enable this feature")
             return pd.DataFrame()
         
+        if not openet_ids:
+            print("No data found for 0 fields")
+            return pd.DataFrame()
+        
         # Parse dates
         start = pd.to_datetime(start_date)
         end = pd.to_datetime(end_date)
@@ -458,28 +755,24 @@ class LocationCropQuery:
         date_range = pd.date_range(start=start.replace(day=1), 
                                    end=end.replace(day=1), freq='MS')
         
-        columns_to_fetch = []
-        for dt in date_range:
-            # Format: MM_YY
-            month_year = dt.strftime("%m_%y")
-            col_name = f"{variable}_{month_year}{unit_suffix}"
-            columns_to_fetch.append((col_name, dt))
+        # MM_YY from the integer month/year arrays (no per-month strftime)
+        columns_to_fetch = [
+            (f"{variable}_{month:02d}_{year % 100:02d}{unit_suffix}", dt)
+            for month, year, dt in zip(date_range.month.tolist(), date_range.year.tolist(), date_range)
+        ]
         
         if not columns_to_fetch:
             print("No data columns found for date range")
             return pd.DataFrame()
         
         # Query geopackage
-        conn = sqlite3.connect(self.crop_gpkg)
+        conn = self._crop_conn
         
         # First, check which columns actually exist in the table
-        check_query = f"PRAGMA table_info({variable})"
         try:
-            table_info = pd.read_sql_query(check_query, conn)
-            existing_columns = set(table_info['name'].tolist())
+            existing_columns = self._table_columns(variable)
         except Exception as e:
             print(f"Error checking table {variable}: {e}")
-            conn.close()
             return pd.DataFrame()
         
         # Filter to only columns that exist
@@ -492,57 +785,64 @@ class LocationCropQuery:
         
         if not valid_columns:
             print(f"No {variable} data columns found for date range {start_date} to {end_date}")
-            conn.close()
             return pd.DataFrame()
         
-        # Build column list
-        cols_str = ", ".join(valid_columns)
+        # a single field is a plain equality lookup, no id list to build
+        if len(openet_ids) == 1:
+            id_filter, ids_param = "= ?", (str(openet_ids[0]),)
+        else:
+            id_filter, ids_param = IN_LIST, (_json_list(str(i) for i in openet_ids),)
         
-        # Build query
-        ids_str = "', '".join(openet_ids)
-        query = f"""
-        SELECT OPENET_ID, {cols_str}
-        FROM {variable}
-        WHERE OPENET_ID IN ('{ids_str}')
-        """
+        # mean/sum reduce inside SQLite, so only one value per month comes back;
+        # TOTAL (not SUM) gives 0.0 for an all-NULL month like pandas' sum.
+        # Unknown aggregations fall back to mean.
+        sql_agg = {"mean": "AVG", "sum": "TOTAL", "median": None}.get(aggregation, "AVG")
+        
+        if sql_agg:
+            aggs_str = ", ".join(f"{sql_agg}({c})" for c in valid_columns)
+            query = f"""
+            SELECT COUNT(*), {aggs_str}
+            FROM {variable}
+            WHERE OPENET_ID {id_filter}
+            """
+        else:
+            query = f"""
+            SELECT {", ".join(valid_columns)}
+            FROM {variable}
+            WHERE OPENET_ID {id_filter}
+            """
         
         try:
-            df = pd.read_sql_query(query, conn)
+            if sql_agg:
+                row = conn.execute(query, ids_param).fetchone()
+                n_rows = row[0]
+            else:
+                rows = conn.execute(query, ids_param).fetchall()
+                n_rows = len(rows)
         except Exception as e:
             print(f"Error querying {variable}: {e}")
             print(f"Ensure table '{variable}' exists in geopackage")
-            conn.close()
             return pd.DataFrame()
         
-        conn.close()
-        
-        if df.empty:
+        if n_rows == 0:
             print(f"No data found for {len(openet_ids)} fields")
             return pd.DataFrame()
         
-        # Convert to long format
-        df_melted = df.melt(id_vars=['OPENET_ID'], 
-                           value_vars=valid_columns,
-                           var_name='month_col', 
-                           value_name=variable)
-        
-        # Map column names back to dates
-        col_to_date = {col: dt for col, dt in zip(valid_columns, valid_dates)}
-        df_melted['datetime'] = df_melted['month_col'].map(col_to_date)
-        
-        # Drop rows with missing dates (in case some columns didn't exist)
-        df_melted = df_melted.dropna(subset=['datetime'])
-        
-        # Aggregate across fields
-        if aggregation == "mean":
-            result = df_melted.groupby('datetime')[variable].mean().reset_index()
-        elif aggregation == "sum":
-            result = df_melted.groupby('datetime')[variable].sum().reset_index()
-        elif aggregation == "median":
-            result = df_melted.groupby('datetime')[variable].median().reset_index()
-        else:
+        if aggregation not in ("mean", "sum", "median"):
             print(f"Unknown aggregation: {aggregation}, using mean")
-            result = df_melted.groupby('datetime')[variable].mean().reset_index()
+        
+        # NULL (no values that month) -> NaN
+        if sql_agg:
+            values = np.array(row[1:], dtype=np.float64)
+        else:
+            # median has no SQL aggregate: reduce the fetched (fields x months)
+            # block column-wise; an all-NaN month stays NaN, as in pandas
+            block = np.array(rows, dtype=np.float64)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                values = np.nanmedian(block, axis=0)
+        
+        result = pd.DataFrame({'datetime': pd.DatetimeIndex(valid_dates), variable: values})
         
         # Sort by date
         result = result.sort_values('datetime').reset_index(drop=True)
@@ -553,6 +853,29 @@ class LocationCropQuery:
         
         return result
     
+    def _filter_ids_by_crop(self, openet_ids: List[str], crop_filter: str,
+                            start_date: str, where: str) -> List[str]:
+        """
+        Keep the fields whose crop (in start_date's year) matches crop_filter.
+        If no crop name matches the filter, all fields are kept. `where` only
+        labels the progress message (e.g. "near Corvallis").
+        """
+        # Find matching crop codes with improved matching (handle singular/plural)
+        matching_codes = self._match_crop(crop_filter.strip())
+        if not matching_codes:
+            print(f"Warning: No crop found matching '{crop_filter}', using all fields")
+            return openet_ids
+        
+        # Parse start date to get year for crop data
+        year = pd.to_datetime(start_date).year
+        crops = self.get_crops_for_fields(openet_ids, year)
+        
+        crops_filtered = crops[crops['crop_code'].isin(matching_codes)]
+        openet_ids = crops_filtered['OPENET_ID'].tolist()
+        matched_crop_names = [self.crop_names[c]['name'] for c in matching_codes[:3]]
+        print(f"Filtered to {len(openet_ids)} {'/'.join(matched_crop_names)} fields {where}")
+        return openet_ids
+    
     def query_variable_by_city(self, city_name: str, variable: str,
                                start_date: str, end_date: str,
                                crop_filter: Optional[str] = None,
@@ -574,7 +897,7 @@ class LocationCropQuery:
             DataFrame with datetime and variable timeseries
         """
         # Step 1: Find fields near the city
-        fields = self.find_fields_by_city(city_name, max_distance)
+        fields = self.find_fields_by_city(city_name, max_distance, columns=("OPENET_ID",))
         
         if fields.empty:
             print(f"No fields found near {city_name}")
@@ -584,33 +907,8 @@ class LocationCropQuery:
         
         # Step 2: Apply crop filter if requested
         if crop_filter:
-            # Parse start date to get year for crop data
-            year = pd.to_datetime(start_date).year
-            crops = self.get_crops_for_fields(openet_ids, year)
-            
-            # Find matching crop codes with improved matching (handle singular/plural)
-            matching_codes = []
-            crop_filter_lower = crop_filter.lower().strip()
-            
-            # Try exact match first
-            for code, info in self.crop_names.items():
-                crop_name_lower = info['name'].lower()
-                # Check if filter is in crop name OR crop name is in filter
-                # This handles:  "cherry" matches "Cherries", "wheat" matches "Winter Wheat"
-                if (crop_filter_lower in crop_name_lower or 
-                    crop_name_lower in crop_filter_lower or
-                    # Handle plurals: "cherry" -> "cherries", "berries" -> "berry"
-                    crop_filter_lower.rstrip('s') in crop_name_lower or
-                    crop_name_lower.rstrip('s') in crop_filter_lower):
-                    matching_codes.append(code)
-            
-            if matching_codes:
-                crops_filtered = crops[crops['crop_code'].isin(matching_codes)]
-                openet_ids = crops_filtered['OPENET_ID'].tolist() 
-                matched_crop_names = [self.crop_names[c]['name'] for c in matching_codes[:3]]
-                print(f"Filtered to {len(openet_ids)} {'/'.join(matched_crop_names)} fields near {city_name}")
-            else:
-                print(f"Warning: No crop found matching '{crop_filter}', using all fields")
+            openet_ids = self._filter_ids_by_crop(openet_ids, crop_filter, start_date,
+                                                  f"near {city_name}")
         else:
             print(f"Querying {variable} for {len(openet_ids)} fields near {city_name}")
         
@@ -647,7 +945,7 @@ class LocationCropQuery:
             DataFrame with datetime and variable timeseries
         """
         # Step 1: Find fields in the county
-        fields = self.find_fields_by_county(county_name)
+        fields = self.find_fields_by_county(county_name, columns=("OPENET_ID",))
         
         if fields.empty:
             print(f"No fields found in {county_name} County")
@@ -657,28 +955,8 @@ class LocationCropQuery:
         
         # Step 2: Apply crop filter if requested
         if crop_filter:
-            year = pd.to_datetime(start_date).year
-            crops = self.get_crops_for_fields(openet_ids, year)
-            
-            # Find matching crop codes with improved matching
-            matching_codes = []
-            crop_filter_lower = crop_filter.lower().strip()
-            
-            for code, info in self.crop_names.items():
-                crop_name_lower = info['name'].lower()
-                if (crop_filter_lower in crop_name_lower or 
-                    crop_name_lower in crop_filter_lower or
-                    crop_filter_lower.rstrip('s') in crop_name_lower or
-                    crop_name_lower.rstrip('s') in crop_filter_lower):
-                    matching_codes.append(code)
-            
-            if matching_codes:
-                crops_filtered = crops[crops['crop_code'].isin(matching_codes)]
-                openet_ids = crops_filtered['OPENET_ID'].tolist()
-                matched_crop_names = [self.crop_names[c]['name'] for c in matching_codes[:3]]
-                print(f"Filtered to {len(openet_ids)} {'/'.join(matched_crop_names)} fields in {county_name} County")
-            else:
-                print(f"Warning: No crop found matching '{crop_filter}', using all fields")
+            openet_ids = self._filter_ids_by_crop(openet_ids, crop_filter, start_date,
+                                                  f"in {county_name} County")
         else:
             print(f"Querying {variable} for {len(openet_ids)} fields in {county_name} County")
         
@@ -0,0 +1,89 @@
+"""
+Payload helpers for SmartTap.
+
+Fetchers hand their result frame over column-wise:
+  {"spec": spec, "data": {"columns": {"datetime": ndarray, <var1>: ndarray, ...},
+                          "records": LazyRecords}}
+
+"records" is kept for callers written against the original list-of-dicts
+contract; the per-row dicts are only built the first time it is read.
+"""
+
+from collections.abc import Sequence
+from typing import Dict, Any
+
+import pandas as pd
+
+
+def frame_to_records(df: pd.DataFrame) -> list:
+    """
+    Same rows as df.to_dict(orient="records"), built by zipping whole-column
+    tolist() results instead of boxing each cell through to_dict.
+    """
+    cols = list(df.columns)
+    return [dict(zip(cols, row)) for row in zip(*(df[c].tolist() for c in cols))]
+
+
+class LazyRecords(Sequence):
+    """Read-only list of row dicts, materialized from a DataFrame on first access."""
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+        self._rows = None
+
+    def _materialize(self) -> list:
+        if self._rows is None:
+            self._rows = frame_to_records(self._df)
+        return self._rows
+
+    def to_frame(self) -> pd.DataFrame:
+        return self._df.copy()
+
+    def __len__(self) -> int:
+        return len(self._df)
+
+    def __getitem__(self, i):
+        return self._materialize()[i]
+
+    def __iter__(self):
+        return iter(self._materialize())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (LazyRecords, list)):
+            return self._materialize() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LazyRecords({len(self)} rows)"
+
+
+def make_payload(spec: Dict[str, Any], df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Wrap a result frame (datetime + variables) in the SmartTap payload format.
+
+    Column arrays are marked read-only, since they may be views of a frame
+    that other payloads are built from; records are built per payload.
+    """
+    df = df.reset_index(drop=True)
+    columns = {}
+    for c in df.columns:
+        arr = df[c].to_numpy()
+        arr.flags.writeable = False
+        columns[c] = arr
+    return {"spec": spec, "data": {"columns": columns, "records": LazyRecords(df)}}
+
+
+def payload_frame(payload: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Rebuild a DataFrame from payload.data, preferring the columnar form and
+    falling back to plain record lists (e.g. payloads loaded from JSON).
+    """
+    data = payload.get("data") or {}
+    columns = data.get("columns")
+    if columns:
+        return pd.DataFrame(columns)
+
+    records = data.get("records") or []
+    if isinstance(records, LazyRecords):
+        return records.to_frame()
+    return pd.DataFrame.from_records(records)
@@ -3,10 +3,12 @@ from __future__ import annotations
 from typing import Dict, Any, List
 import pandas as pd
 
+from .payload import payload_frame
+
 def validate_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
-    """Return a validation report (warnings/errors) for payload.data.records."""
+    """Return a validation report (warnings/errors) for payload.data."""
     spec = payload.get("spec", {})
-    records = (payload.get("data") or {}).get("records") or []
+    df = payload_frame(payload)
     report = {
         "ok": True,
         "errors": [],
@@ -18,12 +20,11 @@ def validate_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
         "end_date": spec.get("end_date"),
     }
 
-    if not records:
+    if df.empty:
         report["ok"] = False
         report["errors"].append("No records returned.")
         return report
 
-    df = pd.DataFrame(records)
     if "datetime" not in df.columns:
         report["ok"] = False
         report["errors"].append("Missing 'datetime' column in records.")
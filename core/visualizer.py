@@ -1,10 +1,17 @@
 import base64
 import io
-from typing import Dict, Any, List, Tuple
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Any, List, Tuple
 
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib
+
+from .payload import frame_to_records, payload_frame
+
+# matplotlib is only imported once a PNG is rendered; vega_spec and the
+# payload helpers never need it
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
 
 
 VAR_LABELS = {
@@ -23,6 +30,40 @@ VAR_LABELS = {
     "P_rz": "Root Zone Precip (mm)",
 }
 
+# Line series longer than this are thinned with LTTB before plotting. The
+# timeseries PNG is ~1400 px wide, so this is still several points per pixel
+# column, and the full 2015-2025 daily AgriMet range (~4000 days) is drawn
+# unthinned.
+PNG_MAX_LINE_POINTS = 5000
+
+# zlib level for the PNG writer (Pillow's default is 6). Charts are written
+# once and served, so trade some file size for a faster encode.
+PNG_COMPRESS_LEVEL = 1
+
+
+def _agg_figure(figsize) -> "Figure":
+    """Figure bound straight to an Agg canvas, bypassing pyplot's figure registry."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+@lru_cache(maxsize=1)
+def _tab20_colors() -> np.ndarray:
+    # tab20 sampled once; the crop charts index into it instead of re-sampling
+    # the colormap per call
+    import matplotlib
+
+    return matplotlib.colormaps["tab20"](np.arange(20))
+
+
+def _tab20(n: int) -> np.ndarray:
+    # Past 20 entries tab20(range(n)) repeats the last color; keep that
+    return _tab20_colors()[np.minimum(np.arange(n), 19)]
+
 
 def create_crop_bar_chart(crop_summary: pd.DataFrame, location: str, year: int, 
                           top_n: int = 15) -> Tuple[bytes, Dict[str, Any]]:
@@ -77,11 +118,12 @@ def create_crop_bar_chart(crop_summary: pd.DataFrame, location: str, year: int,
     }
     
     # Create matplotlib PNG
-    fig, ax = plt.subplots(figsize=(10, 8))
+    fig = _agg_figure((10, 8))
+    ax = fig.add_subplot(111)
     
     # Create color map by group
     groups = top_crops['Group'].unique()
-    colors = plt.cm.tab20(range(len(groups)))
+    colors = _tab20(len(groups))
     group_colors = dict(zip(groups, colors))
     bar_colors = [group_colors[g] for g in top_crops['Group']]
     
@@ -94,14 +136,15 @@ def create_crop_bar_chart(crop_summary: pd.DataFrame, location: str, year: int,
     ax.grid(axis='x', alpha=0.3)
     
     # Add legend for groups
-    handles = [plt.Rectangle((0,0),1,1, color=group_colors[g]) for g in groups]
+    from matplotlib.patches import Rectangle
+    handles = [Rectangle((0,0),1,1, color=group_colors[g]) for g in groups]
     ax.legend(handles, groups, title='Crop Group', bbox_to_anchor=(1.05, 1), loc='upper left')
     
-    plt.tight_layout()
+    fig.tight_layout()
     
     buf = io.BytesIO()
-    fig.savefig(buf, format="png", dpi=150, bbox_inches='tight')
-    plt.close(fig)
+    fig.savefig(buf, format="png", dpi=150, bbox_inches='tight',
+                pil_kwargs={"compress_level": PNG_COMPRESS_LEVEL})
     buf.seek(0)
     
     return buf.read(), vega
@@ -156,9 +199,10 @@ def create_crop_pie_chart(crop_summary: pd.DataFrame, location: str, year: int,
     }
     
     # Create matplotlib PNG
-    fig, ax = plt.subplots(figsize=(10, 8))
+    fig = _agg_figure((10, 8))
+    ax = fig.add_subplot(111)
     
-    colors = plt.cm.tab20(range(len(group_summary)))
+    colors = _tab20(len(group_summary))
     wedges, texts, autotexts = ax.pie(
         group_summary['Field Count'],
         labels=group_summary['Group'],
@@ -178,23 +222,56 @@ def create_crop_pie_chart(crop_summary: pd.DataFrame, location: str, year: int,
     ax.set_title(f'Crop Distribution by Group - {location} ({year})', 
                  fontsize=14, fontweight='bold', pad=20)
     
-    plt.tight_layout()
+    fig.tight_layout()
     
     buf = io.BytesIO()
-    fig.savefig(buf, format="png", dpi=150, bbox_inches='tight')
-    plt.close(fig)
+    fig.savefig(buf, format="png", dpi=150, bbox_inches='tight',
+                pil_kwargs={"compress_level": PNG_COMPRESS_LEVEL})
     buf.seek(0)
     
     return buf.read(), vega
 
 
+def _iso_strings(values) -> list:
+    """
+    Timestamp.isoformat() of each datetime in `values`, formatted as one
+    column. Naive whole-second stamps (every fetcher's output) go through
+    np.datetime_as_string, which renders them identically.
+    """
+    dt = pd.DatetimeIndex(pd.to_datetime(values))
+    if dt.tz is None and (dt.isna() | (dt.floor("s") == dt)).all():
+        return np.datetime_as_string(dt.to_numpy(), unit="s").tolist()
+    return [t.isoformat() for t in dt]
+
+
 def _json_safe_records(df: pd.DataFrame) -> list[dict]:
     """Convert datetime-like objects into JSON-safe strings."""
-    out = df.to_dict(orient="records")
-    for r in out:
-        if "datetime" in r:
-            r["datetime"] = pd.to_datetime(r["datetime"]).isoformat()
-    return out
+    if "datetime" not in df.columns:
+        return frame_to_records(df)
+    iso = pd.Series(_iso_strings(df["datetime"]), index=df.index, dtype=object)
+    return frame_to_records(df.assign(datetime=iso))
+
+
+def _long_records(df: pd.DataFrame, variables: List[str]) -> list[dict]:
+    """
+    JSON-safe {datetime, variable, value} records for a datetime-indexed df,
+    the same as _json_safe_records(df.reset_index().melt(...)) but without
+    building the long frame: the timestamps are formatted once and reused
+    for every variable.
+    """
+    if not variables:
+        return []
+    ts = _iso_strings(df.index)
+    n = len(ts)
+    # one concatenate so mixed int/float columns share a dtype, as in melt
+    values = np.concatenate([df[v].to_numpy() for v in variables]).tolist()
+    records = []
+    for i, v in enumerate(variables):
+        records.extend(
+            {"datetime": t, "variable": v, "value": x}
+            for t, x in zip(ts, values[i * n:(i + 1) * n])
+        )
+    return records
 
 def _label(v: str) -> str:
     return VAR_LABELS.get(v, v)
@@ -204,19 +281,23 @@ def payload_to_df(payload: Dict[str, Any]) -> Tuple[Dict[str, Any], pd.DataFrame
         raise ValueError("Expected payload with keys: spec, data")
 
     spec = payload["spec"]
-    records = payload["data"].get("records") or []
-    if not records:
+    df = payload_frame(payload)
+    if df.empty:
         raise ValueError("No records in payload.data.records")
 
-    df = pd.DataFrame.from_records(records)
-
     if "datetime" not in df.columns:
         if "DATETIME" in df.columns:
             df = df.rename(columns={"DATETIME": "datetime"})
         else:
             raise ValueError("Records must include 'datetime' (or 'DATETIME')")
 
-    df["datetime"] = pd.to_datetime(df["datetime"])
+    # Columnar payloads already carry datetime64; only records loaded from
+    # JSON need parsing, and those are ISO strings from _json_safe_records.
+    if not pd.api.types.is_datetime64_any_dtype(df["datetime"]):
+        try:
+            df["datetime"] = pd.to_datetime(df["datetime"], format="ISO8601")
+        except (ValueError, TypeError):
+            df["datetime"] = pd.to_datetime(df["datetime"])
     df = df.set_index("datetime").sort_index()
 
     requested = spec.get("variables") or [c for c in df.columns]
@@ -228,10 +309,15 @@ def payload_to_df(payload: Dict[str, Any]) -> Tuple[Dict[str, Any], pd.DataFrame
     return spec, df, requested
 
 def _range(s: pd.Series) -> float:
-    s = s.dropna()
-    if s.empty:
+    # fmin/fmax skip NaN in C without building a filtered Series (and, unlike
+    # nanmin/nanmax, return NaN quietly when every value is missing)
+    a = s.to_numpy(dtype=float, na_value=np.nan)
+    if a.size == 0:
+        return 0.0
+    lo = np.fmin.reduce(a)
+    if np.isnan(lo):
         return 0.0
-    return float(s.max() - s.min())
+    return float(np.fmax.reduce(a) - lo)
 
 def choose_view(df: pd.DataFrame, variables: List[str], chart_type: str) -> Dict[str, Any]:
     chart_type = (chart_type or "line").lower()
@@ -264,10 +350,15 @@ def choose_view(df: pd.DataFrame, variables: List[str], chart_type: str) -> Dict
     return {"mode": "facet", "vars": vars_,"reason": "3+ variables requested → faceted small multiples."}
 
 
-def vega_spec(payload: Dict[str, Any]) -> Dict[str, Any]:
-    spec, df, vars_ = payload_to_df(payload)
-    chart_type = (spec.get("chart_type") or "line").lower()
-    view = choose_view(df, vars_, chart_type)
+# Spec keys the chart title depends on
+_TITLE_SPEC_KEYS = ("title", "dataset", "openet_geo", "location", "location_type",
+                    "crop_filter", "huc8_code")
+
+
+@lru_cache(maxsize=256)
+def _compute_title(spec_items: Tuple[Tuple[str, Any], ...], vars_: Tuple[str, ...]) -> str:
+    """Chart title for a spec, keyed on its title-relevant (key, value) pairs."""
+    spec = dict(spec_items)
 
     # Generate title based on dataset type and query mode
     if spec.get("title"):
@@ -312,23 +403,44 @@ def vega_spec(payload: Dict[str, Any]) -> Dict[str, Any]:
             title = f"{var_label} in {location} ({dataset})"
         else:
             title = f"{location} • {dataset}"
-    
+
+    return title
+
+
+def _chart_title(spec: Dict[str, Any], vars_: List[str]) -> str:
+    spec_items = tuple((k, spec[k]) for k in _TITLE_SPEC_KEYS if k in spec)
+    try:
+        return _compute_title(spec_items, tuple(vars_))
+    except TypeError:
+        # Unhashable spec value; build the title without the cache
+        return _compute_title.__wrapped__(spec_items, tuple(vars_))
+
+
+def prepare(payload: Dict[str, Any]) -> Tuple[Dict[str, Any], pd.DataFrame, List[str], Dict[str, Any], str]:
+    """
+    Parse a payload once for rendering: (spec, df, vars_, view, title).
+    Pass the result as ctx= to png_bytes / vega_spec when producing both.
+    """
+    spec, df, vars_ = payload_to_df(payload)
+    chart_type = (spec.get("chart_type") or "line").lower()
+    view = choose_view(df, vars_, chart_type)
+    return spec, df, vars_, view, _chart_title(spec, vars_)
+
+
+def vega_spec(payload: Dict[str, Any], ctx=None) -> Dict[str, Any]:
+    spec, df, vars_, view, title = ctx or prepare(payload)
+    chart_type = (spec.get("chart_type") or "line").lower()
+
     mark = "bar" if chart_type == "bar" else "line"
 
     # long format (used for single + facet)
     use_vars = view.get("vars", vars_)
-    long_df = df.reset_index().melt(
-        id_vars=["datetime"],
-        value_vars=use_vars,
-        var_name="variable",
-        value_name="value"
-    )
 
     if view["mode"] == "single":
         return {
             "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
             "title": title,
-            "data": {"values": _json_safe_records(long_df)},
+            "data": {"values": _long_records(df, use_vars)},
             "mark": {"type": mark},
             "encoding": {
                 "x": {"field": "datetime", "type": "temporal", "title": "Date/Time"},
@@ -395,7 +507,7 @@ def vega_spec(payload: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
         "title": title,
-        "data": {"values": _json_safe_records(long_df)},
+        "data": {"values": _long_records(df, use_vars)},
         "facet": {"field": "variable", "type": "nominal"},
         "spec": {
             "mark": {"type": mark},
@@ -413,56 +525,62 @@ def vega_spec(payload: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def png_bytes(payload: Dict[str, Any]) -> bytes:
-    spec, df, vars_ = payload_to_df(payload)
-    chart_type = (spec.get("chart_type") or "line").lower()
-    view = choose_view(df, vars_, chart_type)
+def _lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of `threshold` points (always the
+    first and last) that keep the visual shape of the y-over-x line. x and y
+    must be finite float arrays with x ascending.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # threshold - 2 buckets over the interior points 1..n-2
+    every = (n - 2) / (threshold - 2)
+    bounds = np.floor(np.arange(threshold - 1) * every).astype(np.int64) + 1
+    counts = np.diff(bounds)
+    mean_x = np.add.reduceat(x[:n - 1], bounds[:-1]) / counts
+    mean_y = np.add.reduceat(y[:n - 1], bounds[:-1]) / counts
+    # each bucket is scored against the mean of the next one (or the last point)
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    out = np.empty(threshold, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = bounds[i], bounds[i + 1]
+        ax_, ay = x[a], y[a]
+        area = np.abs((ax_ - next_x[i]) * (y[lo:hi] - ay) - (ax_ - x[lo:hi]) * (next_y[i] - ay))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
 
-    # Generate title based on dataset type and query mode (same logic as vega_spec)
-    if spec.get("title"):
-        title = spec["title"]
-    elif spec.get("dataset") == "openet":
-        # Location-based OpenET queries (new system)
-        if spec.get("openet_geo") == "location" and spec.get("location"):
-            location = spec["location"]
-            location_type = spec.get("location_type", "area")
-            
-            # Add location type label
-            type_label = f"{location_type.title()}" if location_type in ["city", "county"] else ""
-            
-            # Add variables to title
-            if len(vars_) == 1:
-                var_label = f"{vars_[0]}"
-            elif len(vars_) <= 3:
-                var_label = ", ".join(vars_)
-            else:
-                var_label = f"{len(vars_)} variables"
-            
-            # Include crop filter if present
-            crop_filter = spec.get("crop_filter")
-            if crop_filter:
-                title = f"{var_label} for {crop_filter.title()} Fields near {location} ({type_label})"
-            else:
-                title = f"{var_label} near {location} ({type_label})"
-        
-        # Legacy HUC-based queries
-        else:
-            huc8 = spec.get("huc8_code", "")
-            location_name = "Klamath Falls" if huc8 == "18010204" else f"HUC8 {huc8}"
-            title = f"{location_name} • OpenET"
-    else:
-        # AgriMet or other datasets
-        location = spec.get("location", "").title()
-        dataset = spec.get("dataset", "").upper()
-        if len(vars_) == 1:
-            title = f"{vars_[0]} in {location} ({dataset})"
-        elif len(vars_) <= 3:
-            var_label = ", ".join(vars_)
-            title = f"{var_label} in {location} ({dataset})"
-        else:
-            title = f"{location} • {dataset}"
 
-    fig = plt.figure(figsize=(10, 4.8))
+def _line_xy(df: pd.DataFrame, v: str):
+    """
+    x/y to hand to ax.plot for variable v: df.index and df[v] as-is, or an
+    LTTB selection of them when the series is longer than
+    PNG_MAX_LINE_POINTS. Missing values are all kept so the line still
+    breaks at gaps.
+    """
+    if len(df) <= PNG_MAX_LINE_POINTS:
+        return df.index, df[v]
+
+    y = df[v].to_numpy(dtype="float64", na_value=np.nan)
+    x = df.index.asi8.astype("float64")
+    finite = np.flatnonzero(np.isfinite(y))
+    keep = finite[_lttb_indices(x[finite], y[finite], PNG_MAX_LINE_POINTS)]
+    if len(finite) < len(y):
+        keep = np.union1d(keep, np.flatnonzero(~np.isfinite(y)))
+    return df.index[keep], df[v].iloc[keep]
+
+
+def png_bytes(payload: Dict[str, Any], ctx=None) -> bytes:
+    spec, df, vars_, view, title = ctx or prepare(payload)
+    chart_type = (spec.get("chart_type") or "line").lower()
+
+    fig = _agg_figure((10, 4.8))
     fig.suptitle(title)
 
     if view["mode"] == "single":
@@ -496,7 +614,7 @@ def png_bytes(payload: Dict[str, Any]) -> bytes:
     
         else:
             for v in view["vars"]:
-                ax.plot(df.index, df[v], label=_label(v))
+                ax.plot(*_line_xy(df, v), label=_label(v))
 
             if len(view["vars"]) == 1:
                 ax.set_ylabel(_label(view["vars"][0]))
@@ -516,10 +634,10 @@ def png_bytes(payload: Dict[str, Any]) -> bytes:
 
         if chart_type == "bar":
             ax1.bar(df.index, df[left])
-            ax2.plot(df.index, df[right])
+            ax2.plot(*_line_xy(df, right))
         else:
-            ax1.plot(df.index, df[left], label=left)
-            ax2.plot(df.index, df[right], label=right)
+            ax1.plot(*_line_xy(df, left), label=left)
+            ax2.plot(*_line_xy(df, right), label=right)
 
         ax1.set_ylabel(_label(left))
         ax2.set_ylabel(_label(right))
@@ -536,7 +654,7 @@ def png_bytes(payload: Dict[str, Any]) -> bytes:
             if chart_type == "bar":
                 ax.bar(df.index, df[v])
             else:
-                ax.plot(df.index, df[v])
+                ax.plot(*_line_xy(df, v))
             ax.set_ylabel(_label(v))
             if i == n:
                 ax.set_xlabel("Date/Time")
@@ -556,8 +674,8 @@ def png_bytes(payload: Dict[str, Any]) -> bytes:
     fig.tight_layout(rect=[0, 0.02, 1, 0.92])
 
     buf = io.BytesIO()
-    fig.savefig(buf, format="png", dpi=160)
-    plt.close(fig)
+    fig.savefig(buf, format="png", dpi=160,
+                pil_kwargs={"compress_level": PNG_COMPRESS_LEVEL})
     return buf.getvalue()
 
 def png_base64(payload: Dict[str, Any]) -> str:
@@ -9,6 +9,11 @@ from pathlib import Path
 DEFAULT_MODEL = "gemma3:latest"
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 
+# How many requests the Ollama server decodes at once. Batched parsing
+# (interpretation.get_task_specifications) keeps this many in flight; start
+# the server with the same value, e.g. `OLLAMA_NUM_PARALLEL=8 ollama serve`.
+OLLAMA_NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+
 def get_model_name():
     """Get the current parser model from environment or use default"""
     return os.getenv("SMARTTAP_MODEL", DEFAULT_MODEL)
@@ -17,6 +22,17 @@ def set_model_name(model_name):
     """Set the parser model for the current session"""
     os.environ["SMARTTAP_MODEL"] = model_name
 
+def fast_path_enabled():
+    """Whether plain AgriMet queries may skip the LLM (SMARTTAP_FAST_PATH=0 disables)"""
+    return os.getenv("SMARTTAP_FAST_PATH", "1") != "0"
+
+# Parsed specs kept in memory per (query, model, day); SMARTTAP_SPEC_CACHE=0 disables
+SPEC_CACHE_SIZE = int(os.getenv("SMARTTAP_SPEC_CACHE_SIZE", "256"))
+
+def spec_cache_enabled():
+    """Whether repeated queries may reuse an earlier LLM parse"""
+    return os.getenv("SMARTTAP_SPEC_CACHE", "1") != "0" and SPEC_CACHE_SIZE > 0
+
 # Supported models for evaluation (examples - install with ollama pull)
 SUPPORTED_MODELS = [
     "gemma3:latest",
@@ -1,8 +1,13 @@
+import asyncio
 import ollama
 import json
 import os
+import re
+import threading
+from collections import OrderedDict
 from datetime import date
-from .config import get_model_name
+from .config import (OLLAMA_NUM_PARALLEL, SPEC_CACHE_SIZE, fast_path_enabled,
+                     get_model_name, spec_cache_enabled)
 
 # Load keyword mappings
 def load_keyword_mappings():
@@ -30,7 +35,79 @@ def load_keyword_mappings():
     
     return variable_keywords, crop_keywords
 
-def get_task_specification(user_query):
+# -------------------------
+# Deterministic fast path
+# -------------------------
+# Plain AgriMet requests ("Show me wind speed in Pendleton for 2021") map to a
+# spec without any judgement calls, so they are answered here instead of by a
+# model round-trip. Anything outside this narrow grammar goes to the LLM.
+
+AGRIMET_STATIONS = ("corvallis", "pendleton", "hood river", "klamath falls", "ontario")
+_STATION_RE = re.compile(r"\b(" + "|".join(s.replace(" ", r"\s+") for s in AGRIMET_STATIONS) + r")\b")
+
+# checked in order, each match is blanked before the next pattern runs so
+# "max temperature" is MX and not also OBM. Precipitation is left out: its
+# AgriMet/OpenET routing depends on context the LLM prompt spells out.
+_FAST_VARIABLES = (
+    ("MX", re.compile(r"\b(max(imum)?|high(est)?)\s+temp(erature)?s?\b")),
+    ("MN", re.compile(r"\b(min(imum)?|low(est)?)\s+temp(erature)?s?\b")),
+    ("OBM", re.compile(r"\b((average|avg|mean)\s+)?temp(erature)?s?\b")),
+    ("SR", re.compile(r"\bsolar(\s+radiation)?\b")),
+    ("WS", re.compile(r"\bwind(\s+speeds?)?\b")),
+    ("TU", re.compile(r"\b(relative\s+)?humidity\b")),
+)
+_YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
+
+# the only other words a fast-path query may contain
+_FAST_FILLER = frozenset("""
+    show me the what whats s is was were in at for of plot graph display give get
+    data daily values readings a an how did do does look looks like from to during
+    please station weather
+""".split())
+
+def _fast_path_spec(user_query):
+    """
+    Spec for a single-variable, single-station AgriMet query with at most a
+    year or a from/to year range, or None when the query needs the LLM.
+    """
+    text = user_query.lower()
+
+    stations = {re.sub(r"\s+", " ", m) for m in _STATION_RE.findall(text)}
+    if len(stations) != 1:
+        return None
+    text = _STATION_RE.sub(" ", text)
+
+    variables = []
+    for var, pattern in _FAST_VARIABLES:
+        text, n = pattern.subn(" ", text)
+        if n:
+            variables.append(var)
+    if len(variables) != 1:
+        return None
+
+    years = [int(m.group()) for m in _YEAR_RE.finditer(text)]
+    text = _YEAR_RE.sub(" ", text)
+    if any(w not in _FAST_FILLER for w in re.findall(r"[a-z]+|\d+", text)):
+        return None
+
+    if not years:
+        years = [2024]  # same default the LLM prompt prescribes
+    if len(years) > 2 or years[0] > years[-1]:
+        return None
+
+    return {
+        "task": "visualize_timeseries",
+        "dataset": "agrimet",
+        "location": stations.pop(),
+        "variables": variables,
+        "start_date": f"{years[0]}-01-01",
+        "end_date": f"{years[-1]}-12-31",
+        "interval": "daily",
+        "chart_type": "line",
+    }
+
+def _build_messages(user_query):
+    """System prompt + user turn for the query-to-spec conversion."""
 
     today = date.today().strftime("%Y-%m-%d")
     
@@ -151,21 +228,12 @@ Result: {{"task": "visualize_timeseries", "dataset": "openet", "openet_geo": "lo
 
 Output ONLY valid JSON. No explanations."""
 
-    # Get configured model (defaults to gemma2:2b)
-    model_name = get_model_name()
-    
-    #using json format to force structured output
-    response = ollama.chat(
-        model=model_name, 
-        format='json',
-        messages=[
-            {'role': 'system', 'content': system_prompt},
-            {'role': 'user', 'content': user_query},
-        ]
-    )
-    
-    raw_content = response.message.content
-    
+    return [
+        {'role': 'system', 'content': system_prompt},
+        {'role': 'user', 'content': user_query},
+    ]
+
+def _parse_spec(raw_content):
     try:
         parsed = json.loads(raw_content)
         return parsed
@@ -174,11 +242,118 @@ Output ONLY valid JSON. No explanations."""
     except Exception as e:
         return {"error": "Unexpected Error", "details": str(e), "raw": raw_content}
 
+# -------------------------
+# Spec cache
+# -------------------------
+# LRU of parsed specs stored as JSON text, so every hit hands back a fresh dict
+# that callers (validate_and_fix_spec, smarttap.py) are free to mutate. The key
+# carries today's date because the system prompt resolves "last year" etc.
+# against it. Error results are not stored, so a retry goes back to the model.
+_SPEC_CACHE = OrderedDict()
+_SPEC_CACHE_LOCK = threading.Lock()
+
+def _spec_cache_key(user_query, model_name):
+    # Case, spacing and trailing punctuation don't change what is being asked;
+    # word order does ("2022 to 2020"), so the words themselves are kept as-is.
+    normalized = " ".join(user_query.lower().split()).rstrip(" .?!")
+    return (normalized, model_name, date.today().isoformat())
+
+def _spec_cache_get(key):
+    with _SPEC_CACHE_LOCK:
+        cached = _SPEC_CACHE.get(key)
+        if cached is None:
+            return None
+        _SPEC_CACHE.move_to_end(key)
+    return json.loads(cached)
+
+def _spec_cache_put(key, spec):
+    if not isinstance(spec, dict) or "error" in spec:
+        return
+    with _SPEC_CACHE_LOCK:
+        _SPEC_CACHE[key] = json.dumps(spec)
+        _SPEC_CACHE.move_to_end(key)
+        while len(_SPEC_CACHE) > SPEC_CACHE_SIZE:
+            _SPEC_CACHE.popitem(last=False)
+
+def clear_spec_cache():
+    with _SPEC_CACHE_LOCK:
+        _SPEC_CACHE.clear()
+
+def _spec_before_llm(user_query):
+    """
+    (spec, cache_key) for a query before any model call: spec is the
+    fast-path or cached answer, or None when the model has to be asked.
+    cache_key is None when the spec cache is off.
+    """
+    if fast_path_enabled():
+        spec = _fast_path_spec(user_query)
+        if spec is not None:
+            return spec, None
+
+    if not spec_cache_enabled():
+        return None, None
+    key = _spec_cache_key(user_query, get_model_name())
+    return _spec_cache_get(key), key
+
+def _spec_from_llm(raw_content, cache_key):
+    spec = _parse_spec(raw_content)
+    if cache_key is not None:
+        _spec_cache_put(cache_key, spec)
+    return spec
+
+def get_task_specification(user_query):
+    spec, key = _spec_before_llm(user_query)
+    if spec is not None:
+        return spec
+
+    #using json format to force structured output
+    response = ollama.chat(
+        model=get_model_name(),
+        format='json',
+        messages=_build_messages(user_query)
+    )
+    return _spec_from_llm(response.message.content, key)
+
+async def get_task_specification_async(user_query, client=None):
+    """
+    Same as get_task_specification, but awaits an ollama.AsyncClient so
+    several queries can be in flight at once.
+    """
+    spec, key = _spec_before_llm(user_query)
+    if spec is not None:
+        return spec
+
+    client = client or ollama.AsyncClient()
+    response = await client.chat(
+        model=get_model_name(),
+        format='json',
+        messages=_build_messages(user_query)
+    )
+    return _spec_from_llm(response.message.content, key)
+
+async def _gather_specs(queries, max_parallel):
+    client = ollama.AsyncClient()
+    slots = asyncio.Semaphore(max_parallel)
+
+    async def one(query):
+        async with slots:
+            return await get_task_specification_async(query, client)
+
+    return await asyncio.gather(*(one(q) for q in queries))
+
+def get_task_specifications(queries, max_parallel=OLLAMA_NUM_PARALLEL):
+    """
+    Parse a batch of queries concurrently (at most max_parallel requests
+    outstanding). Results come back in query order. The Ollama server only
+    decodes them in parallel when started with OLLAMA_NUM_PARALLEL > 1.
+    """
+    return asyncio.run(_gather_specs(list(queries), max_parallel))
+
 
 if __name__ == "__main__":
     # Test queries
     queries = ["Compare temperature and precipitation in Corvallis during summer 2024"]
 
-    for query in queries:
+    for query, spec in zip(queries, get_task_specifications(queries)):
         print(f"User Query: {query}")
-        print(json.dumps(get_task_specification(query), indent=2))
\ No newline at end of file
+        print(json.dumps(spec, indent=2))
\ No newline at end of file
@@ -3,22 +3,40 @@ import pandas as pd
 
 IN_DIR = "data/archive/openet_csv_out"
 OUT = os.path.join("data", "openet", "huc_combined_long.csv")
+CHUNK_ROWS = 100_000
 
 os.makedirs(os.path.dirname(OUT), exist_ok=True)
 
-dfs = []
-for f in glob.glob(os.path.join(IN_DIR, "*_long.csv")):
-    dfs.append(pd.read_csv(f))
+files = sorted(glob.glob(os.path.join(IN_DIR, "*_long.csv")))
 
-combined = pd.concat(dfs, ignore_index=True)
+# the output header is the union of every input header (first-seen order,
+# as pd.concat would give); chunks missing a column get it as NaN
+columns = []
+for f in files:
+    for c in pd.read_csv(f, nrows=0).columns:
+        if c not in columns:
+            columns.append(c)
+if "datetime" not in columns:
+    columns.append("datetime")
 
-combined["month"] = combined["month"].fillna(1).astype(int)
-combined["year"] = combined["year"].astype(int)
-combined["datetime"] = pd.to_datetime(
-    dict(year=combined["year"], month=combined["month"], day=1),
-    errors="coerce"
-)
-combined = combined.dropna(subset=["datetime"])
+# stream every input in fixed-size chunks straight to OUT, so memory stays
+# flat no matter how many / how large the exports are
+rows = 0
+with open(OUT, "w", newline="") as out_fp:
+    pd.DataFrame(columns=columns).to_csv(out_fp, index=False)
+    for f in files:
+        for chunk in pd.read_csv(f, engine="c", chunksize=CHUNK_ROWS):
+            chunk["month"] = chunk["month"].fillna(1).astype("int32")
+            chunk["year"] = chunk["year"].astype("int32")
+            # build YYYYMMDD ints and parse with a fixed format (vectorized, no per-row assembly)
+            chunk["datetime"] = pd.to_datetime(
+                chunk["year"] * 10000 + chunk["month"] * 100 + 1,
+                format="%Y%m%d",
+                errors="coerce",
+            )
+            chunk = chunk.dropna(subset=["datetime"])
 
-combined.to_csv(OUT, index=False)
-print("Saved:", OUT, "rows=", len(combined))
+            chunk.reindex(columns=columns).to_csv(out_fp, header=False, index=False)
+            rows += len(chunk)
+
+print("Saved:", OUT, "rows=", rows)
@@ -1,7 +1,10 @@
+import numpy as np
 import pandas as pd
 import requests
 import io
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Oregon AgriMet Stations with verified data
 # CRVO = Corvallis (Willamette Valley)
@@ -22,6 +25,22 @@ STATIONS = {
 PARAMS = "mx,mn,pc,sr,ws"
 YEARS = range(2015, 2026)  # 2015 through 2025
 
+# station-years fetched at once; the requests are independent and mostly
+# waiting on the network, but keep the load on usbr.gov bounded
+FETCH_WORKERS = 5
+
+# one keep-alive session for every fetch, so station-years after the first
+# reuse pooled connections instead of a new TCP+TLS handshake each. The pool
+# holds a connection per worker; transient connection errors and 5xx
+# responses are retried with backoff.
+SESSION = requests.Session()
+SESSION.headers.update({'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)'})
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=FETCH_WORKERS,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504)),
+))
+
 def fetch_station_data(station_id, year):
     url = "https://www.usbr.gov/pn-bin/daily.pl"
     params = {
@@ -30,19 +49,22 @@ def fetch_station_data(station_id, year):
         'end': f"{year}-12-31",
         'format': 'csv'
     }
-    headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)'}
 
     print(f"Fetching {year} data for {STATIONS[station_id]} ({station_id})...")
     
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=40)
+        response = SESSION.get(url, params=params, timeout=40)
         response.raise_for_status()
         
-        if "DateTime" not in response.text:
+        #check and parse the raw body; no decoded str copy of the CSV
+        body = response.content
+        if b"DateTime" not in body:
             print(f"Error for {station_id}: Server returned invalid format.")
             return None
 
-        df = pd.read_csv(io.StringIO(response.text))
+        #dates come back ISO formatted, the format the local AgriMet reader
+        #expects; a body that doesn't match keeps them as text
+        df = pd.read_csv(io.BytesIO(body), parse_dates=['DateTime'], date_format='ISO8601')
         
         #strip station prefix (crvo_mx -> mx)
         df.columns = [col.replace(f'{station_id}_', '').strip() for col in df.columns]
@@ -58,11 +80,14 @@ def fetch_station_data(station_id, year):
         }
         df.rename(columns=mapping, inplace=True)
 
-        #calculate daily rainfall from cumulative rainfall
-        df['daily_precip_in'] = df['cum_precip_in'].diff()
+        #calculate daily rainfall from cumulative rainfall in one pass
+        cum = df['cum_precip_in'].to_numpy(dtype="float64")
+        daily = np.zeros_like(cum)
+        np.subtract(cum[1:], cum[:-1], out=daily[1:])
         #handle the reset (if diff is negative, use the raw value)
-        df.loc[df['daily_precip_in'] < 0, 'daily_precip_in'] = df['cum_precip_in']
-        df['daily_precip_in'] = df['daily_precip_in'].fillna(0).round(2)
+        daily = np.where(daily < 0, cum, daily)
+        #gaps (NaN either side of a diff) count as no rain
+        df['daily_precip_in'] = np.round(np.nan_to_num(daily, nan=0.0), 2)
         
         #fill missing solar/wind with 0 rather than NaN
         df = df.fillna(0)
@@ -73,6 +98,43 @@ def fetch_station_data(station_id, year):
         print(f"Connection failed for {station_id}: {e}")
         return None
 
+def fetch_and_save(sid, year, data_dir):
+    """
+    Fetch one station-year, run the quality checks and write its CSV.
+    Returns (output file or None, report lines to print).
+    """
+    import os
+
+    data = fetch_station_data(sid, year)
+    if data is None:
+        return None, []
+
+    data['location'] = STATIONS[sid]
+
+    #quality checks
+    precip_days = (data['daily_precip_in'] > 0).sum()
+    solar_days = (data['solar_langley'] > 0).sum()
+    temp_range = data['max_temp_f'].max() - data['min_temp_f'].min()
+
+    #check if data valid
+    if temp_range < 10:  #sus (low temperature range)
+        return None, [f"Warning: {STATIONS[sid]} {year} has suspicious temperature data (range: {temp_range:.1f}°F)"]
+
+    #check for data coverage
+    expected_days = 366 if year % 4 == 0 else 365
+    if len(data) < expected_days * 0.9:  #less than 90% coverage
+        return None, [f"Warning: {STATIONS[sid]} {year} has incomplete data ({len(data)}/{expected_days} days)"]
+
+    #save to data folder with year in filename
+    location_name = STATIONS[sid].lower().replace(' ', '_')
+    output_file = os.path.join(data_dir, f"{location_name}_weather_{year}.csv")
+    data.to_csv(output_file, index=False)
+
+    return output_file, [
+        f"Saved to {output_file}",
+        f"   → {len(data)} records, {precip_days} rainy days, {solar_days} days w/ solar data",
+    ]
+
 def main():
     import os
     
@@ -82,55 +144,31 @@ def main():
     saved_files = []
     failed_fetches = []
     
-    total_fetches = len(STATIONS) * len(YEARS)
-    current = 0
+    tasks = [(year, sid) for year in YEARS for sid in STATIONS.keys()]
+    total_fetches = len(tasks)
     
     print(f"\n{'='*70}")
     print(f"Fetching data for {len(STATIONS)} stations across {len(YEARS)} years ({total_fetches} total fetches)")
     print(f"{'='*70}\n")
     
-    for year in YEARS:
-        print(f"\n--- Year {year} ---")
-        for sid in STATIONS.keys():
-            current += 1
-            print(f"[{current}/{total_fetches}] ", end="")
-            
-            data = fetch_station_data(sid, year)
-            if data is not None:
-                data['location'] = STATIONS[sid]
-                
-                #quality checks
-                precip_days = (data['daily_precip_in'] > 0).sum()
-                solar_days = (data['solar_langley'] > 0).sum()
-                temp_range = data['max_temp_f'].max() - data['min_temp_f'].min()
-                
-                #check if data valid
-                if temp_range < 10:  #sus (low temperature range)
-                    print(f"Warning: {STATIONS[sid]} {year} has suspicious temperature data (range: {temp_range:.1f}°F)")
-                    failed_fetches.append(f"{STATIONS[sid]} {year}")
-                    time.sleep(2)
-                    continue
-                
-                #check for data coverage
-                expected_days = 366 if year % 4 == 0 else 365
-                if len(data) < expected_days * 0.9:  #less than 90% coverage
-                    print(f"Warning: {STATIONS[sid]} {year} has incomplete data ({len(data)}/{expected_days} days)")
-                    failed_fetches.append(f"{STATIONS[sid]} {year}")
-                    time.sleep(2)
-                    continue
-                
-                #save to data folder with year in filename
-                location_name = STATIONS[sid].lower().replace(' ', '_')
-                output_file = os.path.join(data_dir, f"{location_name}_weather_{year}.csv")
-                data.to_csv(output_file, index=False)
-                saved_files.append(output_file)
-                
-                print(f"Saved to {output_file}")
-                print(f"   → {len(data)} records, {precip_days} rainy days, {solar_days} days w/ solar data")
-            else:
-                failed_fetches.append(f"{STATIONS[sid]} {year}")
-            
-            time.sleep(2)  #be nice to the server
+    #fetch station-years concurrently; report each as it finishes
+    results = {}
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as ex:
+        futures = {ex.submit(fetch_and_save, sid, year, data_dir): (year, sid) for year, sid in tasks}
+        for current, future in enumerate(as_completed(futures), start=1):
+            year, sid = futures[future]
+            output_file, lines = future.result()
+            results[(year, sid)] = output_file
+            print(f"[{current}/{total_fetches}] {STATIONS[sid]} {year}: {'saved' if output_file else 'skipped'}")
+            for line in lines:
+                print(line)
+    
+    #summary lists in year/station order regardless of completion order
+    for year, sid in tasks:
+        if results[(year, sid)]:
+            saved_files.append(results[(year, sid)])
+        else:
+            failed_fetches.append(f"{STATIONS[sid]} {year}")
     
     print(f"\n{'='*70}")
     print(f"SUMMARY")
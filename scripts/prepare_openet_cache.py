@@ -0,0 +1,20 @@
+"""
+Build the Parquet caches for the OpenET combined-long CSVs ahead of time.
+
+fetch_openet_data builds them lazily on first use; run this once after
+combine_openet_field.py / combine_openet_huc.py so no query pays for it:
+
+    python scripts/prepare_openet_cache.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.data_fetcher import build_openet_caches
+
+built = build_openet_caches()
+if not built:
+    print("No combined OpenET CSVs found in data/openet/")
+for path in built:
+    print("Ready:", path)
@@ -5,7 +5,7 @@ from datetime import datetime
 
 from llm.interpretation import get_task_specification
 from core.data_fetcher import fetch_data
-from core.visualizer import png_bytes, vega_spec, payload_to_df, choose_view, create_crop_bar_chart
+from core.visualizer import png_bytes, vega_spec, prepare, create_crop_bar_chart
 from core.validation import validate_payload, validate_and_fix_spec
 from llm.followups import generate_followups_with_gemma
 from llm.session_update import spec_patch_from_followup, apply_patch
@@ -41,8 +41,9 @@ def run_pipeline(query: str, spec: dict, base: str, chart_dir: Path, validation_
             print(" -", w)
 
     # 3) Decide visualization layout
-    spec_, df_, vars_ = payload_to_df(payload)
-    view = choose_view(df_, vars_, spec_.get("chart_type"))
+    # parsed once, shared by the PNG and Vega-Lite renderers below
+    chart_ctx = prepare(payload)
+    spec_, df_, vars_, view, _ = chart_ctx
 
     view_file = validation_dir / f"{base}_view.json"
     with open(view_file, "w") as f:
@@ -55,13 +56,13 @@ def run_pipeline(query: str, spec: dict, base: str, chart_dir: Path, validation_
     print("Visualization decision:", view.get("reason"))
 
     # 4) PNG
-    png_data = png_bytes(payload)
+    png_data = png_bytes(payload, ctx=chart_ctx)
     png_file = chart_dir / f"{base}_chart.png"
     with open(png_file, "wb") as f:
         f.write(png_data)
 
     # 5) Vega-Lite
-    vega = vega_spec(payload)
+    vega = vega_spec(payload, ctx=chart_ctx)
     vega_file = chart_dir / f"{base}_chart_vega.json"
     with open(vega_file, "w") as f:
         json.dump(vega, f, indent=2)
@@ -125,16 +126,18 @@ def handle_crop_summary(spec: dict, base: str, chart_dir: Path):
         if location_type == "county" and location.lower().endswith(" county"):
             location_clean = location[:-7].strip()  # Remove " County"
         
-        # Query based on location type
-        if location_type == "city":
-            df = query_system.query_crops_by_city(location_clean, year=year)
-        elif location_type == "county":
-            df = query_system.query_crops_by_county(location_clean, year=year)
-        else:
-            print(f"Invalid location_type: {location_type}")
-            print(f"   SmartTap only has data for Oregon cities and counties.")
-            print(f"   Try: Corvallis, Hood River, Klamath Falls, Hermiston, etc.")
-            return None
+        # Query based on location type (closing the GeoPackage connections
+        # as soon as the fields are read)
+        with query_system:
+            if location_type == "city":
+                df = query_system.query_crops_by_city(location_clean, year=year)
+            elif location_type == "county":
+                df = query_system.query_crops_by_county(location_clean, year=year)
+            else:
+                print(f"Invalid location_type: {location_type}")
+                print(f"   SmartTap only has data for Oregon cities and counties.")
+                print(f"   Try: Corvallis, Hood River, Klamath Falls, Hermiston, etc.")
+                return None
         
         if df.empty:
             print(f"No crop data found for {location}")
@@ -16,6 +16,11 @@ import os
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from llm.config import SUPPORTED_MODELS, get_model_display_name, set_model_name, get_installed_models
+
+# compare the models on every query, including ones the regex fast path would answer
+os.environ["SMARTTAP_FAST_PATH"] = "0"
+# and time a real model call every time rather than a cached parse
+os.environ["SMARTTAP_SPEC_CACHE"] = "0"
 from llm.interpretation import get_task_specification
 from core.data_fetcher import fetch_data
 from core.visualizer import png_bytes
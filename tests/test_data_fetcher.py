@@ -141,6 +141,61 @@ class TestDataFetcher(unittest.TestCase):
         # Should have 3 days of data
         self.assertEqual(len(records), 3, f"Expected 3 records, got {len(records)}")
 
+    def test_columnar_payload_matches_records(self):
+        """Test that payload.data.columns and the lazy records agree"""
+        spec = {
+            "dataset": "agrimet",
+            "location": "corvallis",
+            "variables": ["OBM", "PC"],
+            "start_date": "2020-07-01",
+            "end_date": "2020-07-03",
+            "interval": "daily"
+        }
+
+        payload = fetch_agrimet_data(spec)
+        columns = payload["data"]["columns"]
+        records = payload["data"]["records"]
+
+        self.assertEqual(list(columns), ["datetime", "OBM", "PC"])
+        self.assertEqual(len(columns["OBM"]), len(records))
+        self.assertEqual([r["PC"] for r in records], columns["PC"].tolist())
+
+    def test_router_columns_format(self):
+        """Test fetch_data(payload_format="columns") omits the records view"""
+        spec = {
+            "dataset": "agrimet",
+            "location": "corvallis",
+            "variables": ["OBM"],
+            "start_date": "2020-07-01",
+            "end_date": "2020-07-03"
+        }
+
+        payload = fetch_data(spec, payload_format="columns")
+        self.assertNotIn("records", payload["data"])
+        self.assertEqual(len(payload["data"]["columns"]["OBM"]), 3)
+
+        with self.assertRaises(ValueError):
+            fetch_data(spec, payload_format="rows")
+
+    def test_cached_payloads_are_independent(self):
+        """Test that editing one fetch_data result doesn't leak into the next"""
+        spec = {
+            "dataset": "agrimet",
+            "location": "corvallis",
+            "variables": ["MX"],
+            "start_date": "2020-07-01",
+            "end_date": "2020-07-03"
+        }
+
+        first = fetch_data(spec)
+        original = first["data"]["records"][0]["MX"]
+        first["data"]["records"][0]["MX"] = 999
+        with self.assertRaises(ValueError):
+            first["data"]["columns"]["MX"][0] = 999
+
+        second = fetch_data(dict(spec))
+        self.assertEqual(second["data"]["records"][0]["MX"], original)
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
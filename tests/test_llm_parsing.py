@@ -6,13 +6,15 @@ Evaluates how well the LLM converts natural language to specs
 
 import unittest
 import json
+import os
 import sys
 from pathlib import Path
+from unittest.mock import patch
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from llm.interpretation import get_task_specification
+from llm.interpretation import get_task_specification, _fast_path_spec, _spec_cache_key
 
 
 class TestLLMParsing(unittest.TestCase):
@@ -43,6 +45,8 @@ class TestLLMParsing(unittest.TestCase):
                 self.assertEqual(actual_val, expected_val,
                     f"Test {test_id}: Field '{field}' expected '{expected_val}', got '{actual_val}'")
     
+    # measure the model itself; the regex fast path has its own tests below
+    @patch.dict(os.environ, {"SMARTTAP_FAST_PATH": "0"})
     def test_parsing_accuracy(self):
         """Run all LLM parsing tests"""
         passed = 0
@@ -89,6 +93,45 @@ class TestLLMParsing(unittest.TestCase):
             f"LLM parsing accuracy {accuracy:.1%} is below 70% threshold")
 
 
+class TestFastPath(unittest.TestCase):
+    """Test the regex fast path that answers plain AgriMet queries without the LLM"""
+
+    def test_plain_agrimet_query(self):
+        """Single variable + station + year range maps straight to a spec"""
+        spec = _fast_path_spec("What's the max temperature in Hood River from 2018 to 2020?")
+        self.assertEqual(spec["dataset"], "agrimet")
+        self.assertEqual(spec["location"], "hood river")
+        self.assertEqual(spec["variables"], ["MX"])
+        self.assertEqual((spec["start_date"], spec["end_date"]), ("2018-01-01", "2020-12-31"))
+
+    def test_ambiguous_queries_fall_back(self):
+        """Precipitation, multiple variables, counties, months and chart types need the LLM"""
+        for query in [
+            "Show me precipitation in Klamath Falls",
+            "Show me max temp and precipitation in Pendleton",
+            "Show temperature in Hood River County",
+            "Show temperature in Corvallis for July 2024",
+            "Show temperature in Corvallis as a bar chart",
+            "Show me the wind speed.",
+        ]:
+            self.assertIsNone(_fast_path_spec(query), query)
+
+
+class TestSpecCacheKey(unittest.TestCase):
+    """Test which queries share a cached LLM parse"""
+
+    def test_cosmetic_differences_share_a_key(self):
+        """Case, spacing and trailing punctuation don't matter"""
+        self.assertEqual(_spec_cache_key("Show ETa in Hood River for 2020", "gemma3:latest"),
+                         _spec_cache_key("  show eta in hood   river for 2020? ", "gemma3:latest"))
+
+    def test_model_and_word_order_are_distinct(self):
+        """A different model or reordered dates is a different request"""
+        key = _spec_cache_key("ETa in Bend from 2020 to 2022", "gemma3:latest")
+        self.assertNotEqual(key, _spec_cache_key("ETa in Bend from 2020 to 2022", "gemma2:2b"))
+        self.assertNotEqual(key, _spec_cache_key("ETa in Bend from 2022 to 2020", "gemma3:latest"))
+
+
 if __name__ == "__main__":
     # Run with verbose output
     suite = unittest.TestLoader().loadTestsFromTestCase(TestLLMParsing)